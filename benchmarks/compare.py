@@ -0,0 +1,72 @@
+"""
+Compares two codec benchmark reports (see benchmarks/run_codec.py) and flags
+regressions. Run from project root:
+
+  python -m benchmarks.compare benchmarks/baseline.json benchmarks/results.json
+  python -m benchmarks.compare OLD NEW --threshold 0.15
+
+A (stage, corpus) regresses when both its ops/sec and its median latency are
+worse by more than the threshold (a fraction, default 0.25, since timings on
+shared machines are noisy). The table shows both ratios the check uses, as
+speedups (below 1 is slower), and the p99 latency for reference.
+Exits with status 1 when anything regressed.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+DEFAULT_THRESHOLD = 0.25
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Prints a table of both reports and returns the regressed keys."""
+    regressions = []
+    base_results = baseline["results"]
+    for key, result in current["results"].items():
+        base = base_results.get(key)
+        if base is None:
+            print(f"{key:40s} {result['ops_per_sec']:>12,.0f} ops/s  (not in baseline)")
+            continue
+
+        ratio = result["ops_per_sec"] / base["ops_per_sec"]
+        p50_ratio = base["p50_us"] / result["p50_us"]
+        flag = ""
+        if ratio < 1 - threshold and p50_ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:40s} {base['ops_per_sec']:>12,.0f} -> {result['ops_per_sec']:>12,.0f} ops/s  x{ratio:5.2f}"
+              f"  p50 {base['p50_us']:>9.2f} -> {result['p50_us']:>9.2f} us  x{p50_ratio:5.2f}"
+              f"  p99 {base['p99_us']:>9.2f} -> {result['p99_us']:>9.2f} us{flag}")
+
+    for key in base_results.keys() - current["results"].keys():
+        print(f"{key:40s} missing from the current report")
+
+    if baseline["meta"].get("accelerated") != current["meta"].get("accelerated"):
+        print("Note: the reports were made with different codec backends")
+    return regressions
+
+
+def compare_files(baseline_path: Path, current_path: Path, threshold: float = DEFAULT_THRESHOLD) -> int:
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    current = json.loads(Path(current_path).read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+    sys.exit(compare_files(args.baseline, args.current, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
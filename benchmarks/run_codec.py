@@ -0,0 +1,218 @@
+"""
+Times the serial codec stages and the end-to-end helpers over three corpora
+and writes ops/sec plus p50/p99 latency per (stage, corpus) to JSON. Run from
+project root:
+
+  python -m benchmarks.run_codec                       # writes benchmarks/results.json
+  python -m benchmarks.run_codec --output out.json --min-time 0.5
+  python -m benchmarks.run_codec --compare             # then check against benchmarks/baseline.json
+
+Corpora:
+  vanilla   short items, one reference part each (scripts/reference_codes.json)
+  godrolls  godrolls.json
+  modded    the long modded codes in scripts/decode_codes.py that decode cleanly
+
+Caches (parts, varint patterns) warm up during the first pass like they do in
+a long-running process. Set BL4_CODEC_PURE=1 to time the pure-Python codec.
+Timings only compare on the same machine; refresh the committed baseline with
+--output benchmarks/baseline.json when switching machines.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import codec  # noqa: E402
+import serial_codec  # noqa: E402
+import serial_encoder  # noqa: E402
+from codec.b4s.b85.decode import decode  # noqa: E402
+from codec.b4s.b85.encode import encode  # noqa: E402
+from codec.b4s.serial.deserialize import deserialize  # noqa: E402
+from codec.b4s.serial.formatter import format_blocks  # noqa: E402
+from codec.b4s.serial.from_string import from_string  # noqa: E402
+from codec.b4s.serial.serialize import serialize  # noqa: E402
+from codec.b4s.serial.item import DecodedItem  # noqa: E402
+from codec.b4s.serial.level_patch import patch_level  # noqa: E402
+from tests.corpora import godroll_texts, modded_serials, reference_texts  # noqa: E402
+
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results.json"
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+# Number of short items taken from the reference codes
+VANILLA_ITEMS = 500
+# Timing rounds per (stage, corpus)
+ROUNDS = 5
+
+
+def _decodes_cleanly(serial: str) -> bool:
+    try:
+        return deserialize(decode(serial))[2] is None
+    except Exception:
+        return False
+
+
+def _modded_serials() -> list[str]:
+    # Some of these codes are damaged (copied from chat); only the clean ones are timed
+    return [code for code in modded_serials() if _decodes_cleanly(code)]
+
+
+def load_corpora() -> dict[str, dict[str, list]]:
+    """Inputs for every stage, per corpus."""
+    corpora = {}
+    sources = {
+        "vanilla": [serial_codec.encode_string_to_serial(t)[0] for t in reference_texts(VANILLA_ITEMS)],
+        "godrolls": [serial_codec.encode_string_to_serial(t)[0] for t in godroll_texts()],
+        "modded": _modded_serials(),
+    }
+    for name, serials in sources.items():
+        data = [decode(s) for s in serials]
+        blocks = [deserialize(d)[0] for d in data]
+        corpora[name] = {
+            "serials": serials,
+            "data": data,
+            "serialized": [serialize(b) for b in blocks],
+            "blocks": blocks,
+            "texts": [format_blocks(b) for b in blocks],
+        }
+    return corpora
+
+
+def _decode_serial_cold(serial: str):
+    serial_codec.clear_cache()
+    return serial_codec.decode_serial_to_string(serial)
+
+
+def _patch_level(serial: str):
+    # Level sync to a typical character level
+    return patch_level(serial, 60)
+
+
+def _patch_level_validated(serial: str):
+    return patch_level(serial, 60, validate=True)
+
+
+def _reencode_level(serial: str):
+    # What patch_level saves: a full decode, the level edit and a full encode
+    item = DecodedItem.from_serial(serial)
+    item.level = 60
+    return item.to_serial()
+
+
+# Stage name -> (function, corpus input it takes)
+STAGES = {
+    "b85_decode": (decode, "serials"),
+    "b85_encode": (encode, "serialized"),
+    "deserialize": (deserialize, "data"),
+    "serialize": (serialize, "blocks"),
+    "from_string": (from_string, "texts"),
+    "format_blocks": (format_blocks, "blocks"),
+    "decode_serial_to_string": (_decode_serial_cold, "serials"),
+    "decode_serial_to_string_cached": (serial_codec.decode_serial_to_string, "serials"),
+    "encode_to_base85": (serial_encoder.encode_to_base85, "texts"),
+    "patch_level": (_patch_level, "serials"),
+    "patch_level_validated": (_patch_level_validated, "serials"),
+    "reencode_level": (_reencode_level, "serials"),
+}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _pass_time(fn, inputs: list, clock) -> float:
+    start = clock()
+    for item in inputs:
+        fn(item)
+    return clock() - start
+
+
+def time_stage(fn, inputs: list, min_time: float, rounds: int = ROUNDS) -> dict:
+    """
+    Spends about min_time seconds on fn over the inputs, split into rounds.
+    Each round times whole passes for the throughput, kept from the fastest
+    round like timeit, then times single calls for the latency percentiles.
+    """
+    clock = time.perf_counter
+    budget = min_time / rounds / 2
+    best = 0.0
+    latencies = []
+    for _ in range(rounds):
+        total, calls = 0.0, 0
+        while total < budget:
+            total += _pass_time(fn, inputs, clock)
+            calls += len(inputs)
+        best = max(best, calls / total)
+
+        total = 0.0
+        while total < budget:
+            done = len(latencies)
+            for item in inputs:
+                start = clock()
+                fn(item)
+                latencies.append(clock() - start)
+            total += sum(latencies[done:])
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(best, 1),
+        "p50_us": round(_percentile(latencies, 0.50) * 1e6, 2),
+        "p99_us": round(_percentile(latencies, 0.99) * 1e6, 2),
+    }
+
+
+def run(min_time: float, stages=None, corpora_names=None) -> dict:
+    corpora = load_corpora()
+    results = {}
+    for stage, (fn, input_key) in STAGES.items():
+        if stages and stage not in stages:
+            continue
+        for corpus_name, corpus in corpora.items():
+            if corpora_names and corpus_name not in corpora_names:
+                continue
+            key = f"{stage}/{corpus_name}"
+            results[key] = time_stage(fn, corpus[input_key], min_time)
+            r = results[key]
+            print(f"{key:40s} {r['ops_per_sec']:>12,.0f} ops/s  p50 {r['p50_us']:>9.2f} us  p99 {r['p99_us']:>9.2f} us")
+
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "accelerated": codec.ACCELERATED,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--min-time", type=float, default=0.4, help="Seconds spent per stage and corpus")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="Only time this stage (repeatable)")
+    parser.add_argument("--corpus", action="append", choices=["vanilla", "godrolls", "modded"])
+    parser.add_argument("--compare", nargs="?", const=BASELINE, type=Path, metavar="BASELINE",
+                        help="Compare against a baseline afterwards (default benchmarks/baseline.json)")
+    args = parser.parse_args()
+
+    report = run(args.min_time, args.stage, args.corpus)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        from benchmarks.compare import compare_files
+        sys.exit(compare_files(args.compare, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import os
+
+# Set to any non-empty value to force the pure-Python codec
+PURE_ENV_VAR = "BL4_CODEC_PURE"
+
+# Compiled inner loops (codec/lib/_speedups.c), when built and not disabled
+speedups = None
+if not os.environ.get(PURE_ENV_VAR):
+    try:
+        from codec.lib import _speedups as speedups
+    except ImportError:
+        speedups = None
+
+ACCELERATED = speedups is not None
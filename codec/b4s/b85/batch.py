@@ -0,0 +1,109 @@
+from codec import speedups
+from codec.b4s.b85.decode import decode, DIGIT_TABLE, INVALID_DIGIT, MIRROR_TABLE, B85_CHARSET, B85_PADDING_CHAR
+from codec.b4s.b85.encode import encode
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Below this many items the per-item codec is faster than setting up arrays
+MIN_BATCH_SIZE = 16
+
+_PADDING_BYTE = B85_PADDING_CHAR.encode('ascii')
+_CHARSET_ARRAY = np.frombuffer(B85_CHARSET.encode('ascii'), dtype=np.uint8) if np is not None else None
+
+
+def _use_numpy(n_items: int) -> bool:
+    # The compiled per-item codec beats the NumPy pass, only use it over pure Python
+    return np is not None and speedups is None and n_items >= MIN_BATCH_SIZE
+
+
+def _decode_batch_numpy(bodies: list[bytes]) -> list[bytes]:
+    # Pad every body to whole groups with the padding character, which is
+    # exactly what decode() does for a short last group.
+    padded = []
+    offsets = []
+    pos = 0
+    for body in bodies:
+        char_count = len(body) % 5
+        n_bytes = len(body) // 5 * 4 + (char_count - 1 if char_count > 1 else 0)
+        if char_count:
+            body += _PADDING_BYTE * (5 - char_count)
+        padded.append(body)
+        offsets.append((pos, n_bytes))
+        pos += len(body) // 5 * 4
+
+    digits = np.frombuffer(b"".join(padded).translate(DIGIT_TABLE), dtype=np.uint8)
+    groups = digits.reshape(-1, 5).astype(np.uint64)
+    words = groups[:, 0]
+    for i in range(1, 5):
+        words = words * 85 + groups[:, i]
+    out = (words & 0xFFFFFFFF).astype('>u4').tobytes().translate(MIRROR_TABLE)
+
+    return [out[start:start + n_bytes] for start, n_bytes in offsets]
+
+
+def decode_many(serials: list[str]) -> list[bytes]:
+    """
+    Decodes many serials at once, giving the same output as decode() per
+    serial. Raises ValueError like decode() if any serial is invalid.
+    """
+    if not _use_numpy(len(serials)):
+        return [decode(s) for s in serials]
+
+    results = [None] * len(serials)
+    batch_index = []
+    batch_bodies = []
+    for i, serial in enumerate(serials):
+        if not serial.startswith("@U"):
+            raise ValueError("Not a valid Borderlands 4 item serial")
+        try:
+            body = serial[2:].encode('latin-1')
+        except UnicodeEncodeError:
+            raise ValueError("Not a valid Borderlands 4 item serial") from None
+        if INVALID_DIGIT in body.translate(DIGIT_TABLE):
+            # Characters outside the charset change the grouping, leave those to decode()
+            results[i] = decode(serial)
+            continue
+        batch_index.append(i)
+        batch_bodies.append(body)
+
+    if batch_bodies:
+        for i, data in zip(batch_index, _decode_batch_numpy(batch_bodies)):
+            results[i] = data
+    return results
+
+
+def _encode_batch_numpy(buffers: list) -> list[str]:
+    # Zero-fill every buffer to whole words; encode() zero-fills its last group too
+    padded = []
+    offsets = []
+    pos = 0
+    for data in buffers:
+        data = bytes(data)
+        extra_bytes = len(data) % 4
+        n_chars = len(data) // 4 * 5 + (extra_bytes + 1 if extra_bytes else 0)
+        if extra_bytes:
+            data += bytes(4 - extra_bytes)
+        padded.append(data)
+        offsets.append((pos, n_chars))
+        pos += len(data) // 4 * 5
+
+    words = np.frombuffer(b"".join(padded).translate(MIRROR_TABLE), dtype='>u4').astype(np.uint64)
+    digits = np.empty((len(words), 5), dtype=np.uint8)
+    for i in range(4, -1, -1):
+        digits[:, i] = words % 85
+        words //= 85
+    text = _CHARSET_ARRAY[digits].tobytes().decode('ascii')
+
+    return ["@U" + text[start:start + n_chars] for start, n_chars in offsets]
+
+
+def encode_many(buffers: list) -> list[str]:
+    """Encodes many byte buffers at once, giving the same output as encode() per buffer."""
+    if not _use_numpy(len(buffers)):
+        return [encode(data) for data in buffers]
+    return _encode_batch_numpy(buffers)
@@ -1,3 +1,5 @@
+import struct
+from codec import speedups
 from codec.lib.byte_mirror import UINT8_MIRROR
 
 B85_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{/}~"
@@ -8,59 +10,85 @@ REVERSE_LOOKUP = [-1] * 256
 for i, char in enumerate(B85_CHARSET):
     REVERSE_LOOKUP[ord(char)] = i
 
-def decode(serial: str) -> bytes:
-    if not serial.startswith("@U"):
-        raise ValueError("Not a valid Borderlands 4 item serial")
-    
-    serial = serial[2:]
-    
-    result = bytearray()
-    idx = 0
-    size = len(serial)
-    
-    while idx < size:
+# bytes.translate tables: serial character -> digit value (INVALID_DIGIT when
+# the character is not part of the charset), and byte -> bit-mirrored byte.
+INVALID_DIGIT = 0xFF
+DIGIT_TABLE = bytes(v if v >= 0 else INVALID_DIGIT for v in REVERSE_LOOKUP)
+MIRROR_TABLE = bytes(UINT8_MIRROR)
+
+_UINT32_MASK = 0xFFFFFFFF
+
+
+def _decode_digits(d: bytes) -> tuple[bytes, int]:
+    """
+    Decodes a run of valid digit values, the last group may be partial.
+    Returns the packed words and how many of their bytes are valid; a partial
+    last group is packed as a whole word so no second buffer is needed.
+    """
+    full = len(d) - len(d) % 5
+    words = [
+        ((((d[i] * 85 + d[i + 1]) * 85 + d[i + 2]) * 85 + d[i + 3]) * 85 + d[i + 4]) & _UINT32_MASK
+        for i in range(0, full, 5)
+    ]
+    n_bytes = len(words) * 4
+
+    # Handle padding for an incomplete last group
+    char_count = len(d) - full
+    if char_count > 1:
         v = 0
-        char_count = 0
-        
-        # Collect up to 5 valid Base85 characters
-        temp_idx = idx
-        for _ in range(5):
-            if temp_idx < size:
-                char_code = ord(serial[temp_idx])
-                if 0 <= REVERSE_LOOKUP[char_code] < 85:
-                    v = v * 85 + REVERSE_LOOKUP[char_code]
-                    char_count += 1
-                temp_idx += 1
-            else:
-                break
-        idx = temp_idx
-
-        if char_count == 0:
+        for digit in d[full:]:
+            v = v * 85 + digit
+        for _ in range(5 - char_count):
+            v = v * 85 + B85_PADDING_VALUE
+        words.append(v & _UINT32_MASK)
+        n_bytes += char_count - 1
+
+    return struct.pack(f">{len(words)}I", *words), n_bytes
+
+
+def _decode_with_invalid(digits: bytes) -> bytes:
+    # Groups are made of 5 input characters. Invalid characters are skipped
+    # but still count towards their group, which then decodes as a short one.
+    result = bytearray()
+    for start in range(0, len(digits), 5):
+        group = digits[start:start + 5].replace(bytes((INVALID_DIGIT,)), b"")
+        if not group:
             break
-            
-        # Handle padding for incomplete groups
-        if char_count < 5:
-            padding = 5 - char_count
-            for _ in range(padding):
-                v = v * 85 + B85_PADDING_VALUE
-
-        # Extract bytes
-        byte_count = 4
-        if char_count < 5:
-            byte_count = char_count - 1
-
-        if byte_count >= 1:
-            result.append((v >> 24) & 0xFF)
-        if byte_count >= 2:
-            result.append((v >> 16) & 0xFF)
-        if byte_count >= 3:
-            result.append((v >> 8) & 0xFF)
-        if byte_count >= 4:
-            result.append(v & 0xFF)
+        packed, n_bytes = _decode_digits(group)
+        result += packed[:n_bytes]
+    return bytes(result)
+
+
+def decode_view(serial: str) -> memoryview:
+    """
+    Same as decode(), but returns a read-only view that the deserializer can
+    use as-is, so the mirrored buffer is the only copy of the data.
+    """
+    if not serial.startswith("@U"):
+        raise ValueError("Not a valid Borderlands 4 item serial")
+
+    try:
+        raw = serial[2:].encode('latin-1')
+    except UnicodeEncodeError:
+        raise ValueError("Not a valid Borderlands 4 item serial") from None
+
+    digits = raw.translate(DIGIT_TABLE)
+    if INVALID_DIGIT in digits:
+        result = _decode_with_invalid(digits)
+        n_bytes = len(result)
+    elif speedups is not None:
+        # Decoded and mirrored in one pass, already the exact length
+        return memoryview(speedups.b85_decode(digits))
+    else:
+        result, n_bytes = _decode_digits(digits)
 
     # Mirror the bits in each byte
-    mirrored_result = bytearray(len(result))
-    for i, byte in enumerate(result):
-        mirrored_result[i] = UINT8_MIRROR[byte]
-        
-    return bytes(mirrored_result)
+    return memoryview(result.translate(MIRROR_TABLE))[:n_bytes]
+
+
+def decode(serial: str) -> bytes:
+    view = decode_view(serial)
+    data = view.obj
+    if len(data) == len(view):
+        return data
+    return bytes(view)
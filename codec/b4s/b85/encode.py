@@ -1,60 +1,49 @@
-from codec.b4s.b85.decode import B85_CHARSET
-from codec.lib.byte_mirror import UINT8_MIRROR
+import struct
+from codec import speedups
+from codec.b4s.b85.decode import B85_CHARSET, MIRROR_TABLE
 
 _85_1 = 85
 _85_2 = 85 * 85
 _85_3 = 85 * 85 * 85
-_85_4 = 85 * 85 * 85 * 85
 
-def encode(data: bytearray) -> str:
-    bytes_mirrored = bytearray(len(data))
-    for i in range(len(data)):
-        bytes_mirrored[i] = UINT8_MIRROR[data[i]]
+# Two output characters for every value below 85^2
+_DIGIT_PAIRS = tuple(a + b for a in B85_CHARSET for b in B85_CHARSET)
+
+
+def _encode_word(v: int) -> str:
+    return _DIGIT_PAIRS[v // _85_3] + B85_CHARSET[v // _85_2 % _85_1] + _DIGIT_PAIRS[v % _85_2]
+
+
+def encode(data) -> str:
+    """
+    Encodes bytes, a bytearray or a memoryview. For bytes and bytearrays the
+    mirrored copy is the only buffer made; the words are read through views.
+    """
+    if speedups is not None:
+        return speedups.b85_encode(data)
+    if isinstance(data, memoryview):
+        # translate() only exists on bytes and bytearray, and a view can't be
+        # mirrored in place without writing into the caller's buffer, so a
+        # view costs one extra copy here. Items are tens of bytes, which makes
+        # that copy cheaper than mirroring word by word in Python. The
+        # compiled codec above reads views directly.
+        data = data.tobytes()
+    bytes_mirrored = memoryview(data.translate(MIRROR_TABLE))
 
-    result = []
-    idx = 0
     length = len(bytes_mirrored)
     extra_bytes = length % 4
-    full_groups = length // 4
-
-    for _ in range(full_groups):
-        v = (bytes_mirrored[idx] << 24) | (bytes_mirrored[idx+1] << 16) | \
-            (bytes_mirrored[idx+2] << 8) | bytes_mirrored[idx+3]
-        idx += 4
-
-        result.append(B85_CHARSET[v // _85_4])
-        v %= _85_4
-        result.append(B85_CHARSET[v // _85_3])
-        v %= _85_3
-        result.append(B85_CHARSET[v // _85_2])
-        v %= _85_2
-        result.append(B85_CHARSET[v // _85_1])
-        result.append(B85_CHARSET[v % _85_1])
+    full_length = length - extra_bytes
+
+    pairs = _DIGIT_PAIRS
+    charset = B85_CHARSET
+    result = [
+        pairs[v // _85_3] + charset[v // _85_2 % _85_1] + pairs[v % _85_2]
+        for (v,) in struct.iter_unpack('>I', bytes_mirrored[:full_length])
+    ]
 
     if extra_bytes != 0:
-        v = bytes_mirrored[idx]
-        if extra_bytes >= 2:
-            v = (v << 8) | bytes_mirrored[idx+1]
-        if extra_bytes == 3:
-            v = (v << 8) | bytes_mirrored[idx+2]
-            
-        if extra_bytes == 3:
-            v <<= 8
-        elif extra_bytes == 2:
-            v <<= 16
-        else:
-            v <<= 24
-            
-        result.append(B85_CHARSET[v // _85_4])
-        v %= _85_4
-        result.append(B85_CHARSET[v // _85_3])
-
-        if extra_bytes >= 2:
-            v %= _85_3
-            result.append(B85_CHARSET[v // _85_2])
-            
-            if extra_bytes == 3:
-                v %= _85_2
-                result.append(B85_CHARSET[v // _85_1])
-                
+        # Zero-fill the last group; only extra_bytes + 1 characters are kept
+        v = int.from_bytes(bytes_mirrored[full_length:], 'big') << (8 * (4 - extra_bytes))
+        result.append(_encode_word(v)[:extra_bytes + 1])
+
     return "@U" + "".join(result)
@@ -3,8 +3,29 @@ from codec.b4s.serial_datatypes.part.part import Part
 from codec.b4s.serial_tokenizer.tokenizer import Token
 
 class Block:
-    def __init__(self, token: Token):
+    __slots__ = ("token", "value", "value_str", "part")
+
+    def __init__(self, token: Token, value: int = 0, value_str: str = "", part: Optional[Part] = None):
         self.token: Token = token
-        self.value: int = 0
-        self.value_str: str = ""
-        self.part: Optional[Part] = None
+        self.value: int = value
+        self.value_str: str = value_str
+        self.part: Optional[Part] = part
+
+    def __eq__(self, other):
+        if not isinstance(other, Block):
+            return NotImplemented
+        return (self.token == other.token and self.value == other.value
+                and self.value_str == other.value_str and self.part == other.part)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Positional args pickle much faster than the default slot state (batch decoding returns blocks from workers)
+        return Block, (self.token, self.value, self.value_str, self.part)
+
+    def copy(self) -> "Block":
+        """Copy that shares nothing mutable with this block."""
+        return Block(self.token, self.value, self.value_str, self.part.copy() if self.part is not None else None)
+
+    def __repr__(self):
+        return f"Block({self.token.name}, value={self.value}, value_str={self.value_str!r}, part={self.part!r})"
@@ -0,0 +1,96 @@
+from array import array
+from typing import Iterable, Iterator
+from codec.b4s.serial.block import Block
+from codec.b4s.serial_datatypes.part.part import Part, PartSubType, SUBTYPE_INT, SUBTYPE_LIST
+from codec.b4s.serial_tokenizer.tokenizer import Token, TOK_VARINT, TOK_VARBIT, TOK_PART, TOK_STRING
+
+_TOKENS = tuple(Token)
+_SUB_TYPES = tuple(PartSubType)
+
+class BlockStream:
+    """
+    Compact struct-of-arrays storage for a list of blocks.
+
+    Block i is described by tokens[i], values[i] and sub_types[i]:
+      - TOK_VARINT / TOK_VARBIT: values[i] is the value
+      - TOK_PART: values[i] is the part index, sub_types[i] its subtype, and
+        pool[offsets[i]:offsets[i + 1]] holds its value (int) or values (list)
+      - TOK_STRING: values[i] indexes into strings
+    Values are stored as unsigned 32-bit, which covers everything the
+    serial format can carry.
+    """
+    __slots__ = ("tokens", "values", "sub_types", "offsets", "pool", "strings")
+
+    def __init__(self):
+        self.tokens = array('B')
+        self.values = array('I')
+        self.sub_types = array('B')
+        self.offsets = array('I', (0,))
+        self.pool = array('I')
+        self.strings: list[str] = []
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Block]) -> "BlockStream":
+        stream = cls()
+        for block in blocks:
+            stream.append(block)
+        return stream
+
+    def append(self, block: Block):
+        token = block.token
+        value = 0
+        sub_type = 0
+
+        if token == TOK_VARINT or token == TOK_VARBIT:
+            value = block.value
+        elif token == TOK_PART:
+            part = block.part
+            value = part.index
+            sub_type = part.sub_type
+            if sub_type == SUBTYPE_INT:
+                self.pool.append(part.value)
+            elif sub_type == SUBTYPE_LIST:
+                self.pool.extend(part.values)
+        elif token == TOK_STRING:
+            value = len(self.strings)
+            self.strings.append(block.value_str)
+
+        self.tokens.append(token)
+        self.values.append(value)
+        self.sub_types.append(sub_type)
+        self.offsets.append(len(self.pool))
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __getitem__(self, i: int) -> Block:
+        n = len(self.tokens)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("BlockStream index out of range")
+        token = _TOKENS[self.tokens[i]]
+        block = Block(token)
+
+        if token == TOK_VARINT or token == TOK_VARBIT:
+            block.value = self.values[i]
+        elif token == TOK_PART:
+            sub_type = _SUB_TYPES[self.sub_types[i]]
+            part = Part(self.values[i], sub_type)
+            start, end = self.offsets[i], self.offsets[i + 1]
+            if sub_type == SUBTYPE_INT:
+                part.value = self.pool[start]
+            elif sub_type == SUBTYPE_LIST:
+                part.values = self.pool[start:end].tolist()
+            block.part = part
+        elif token == TOK_STRING:
+            block.value_str = self.strings[self.values[i]]
+
+        return block
+
+    def __iter__(self) -> Iterator[Block]:
+        for i in range(len(self.tokens)):
+            yield self[i]
+
+    def to_blocks(self) -> list[Block]:
+        return list(self)
@@ -1,53 +1,108 @@
 import io
+from typing import Iterator, Optional
 from codec.b4s.serial.block import Block
+from codec.b4s.serial.block_stream import BlockStream
 from codec.b4s.serial_datatypes.part.read import read_part
 from codec.b4s.serial_datatypes.varbit.read import read_varbit
 from codec.b4s.serial_datatypes.varint.read import read_varint
 from codec.b4s.serial_datatypes.b4string.read import read_b4string
-from codec.b4s.serial_tokenizer.tokenizer import Tokenizer, Token
-
-def deserialize(data: bytes) -> (list[Block], str):
-    t = Tokenizer(data)
+from codec.b4s.serial_tokenizer.tokenizer import Tokenizer, Token, TOK_SEP1, TOK_VARINT, TOK_VARBIT, TOK_PART, TOK_STRING
 
+def _expect_magic(t: Tokenizer):
     # Expect the magic header as the first bits
-    try:
-        t.expect("magic header", 0, 0, 1, 0, 0, 0, 0)
-    except (IOError, EOFError) as e:
-        return [], t.done_string(), e
+    t.expect("magic header", 0, 0, 1, 0, 0, 0, 0)
 
+def _read_blocks(t: Tokenizer) -> Iterator[tuple[Optional[Block], Optional[Exception]]]:
+    """
+    Yields (block, None) for each block. If a token can't be read, yields
+    (None, error) once and stops.
+    """
     br = t.bit_reader()
-    blocks = []
-    trailing_terminators = 0
+    next_token = t.next_token
+    pending_terminators = 0
 
     while True:
         try:
-            token = t.next_token()
+            token = next_token()
         except EOFError:
             break
         except (IOError, ValueError) as e:
-            return [], t.done_string(), e
-            
-        block = Block(token)
+            yield None, e
+            return
+
+        # Terminators are held back until something else follows them,
+        # since trailing ones are usually the zero-padding read as tokens
+        if token == TOK_SEP1:
+            pending_terminators += 1
+            continue
+        for _ in range(pending_terminators):
+            yield Block(Token.TOK_SEP1), None
+        pending_terminators = 0
 
-        if token == Token.TOK_SEP1:
-            trailing_terminators += 1
+        if token == TOK_VARINT:
+            block = Block(token, read_varint(br))
+        elif token == TOK_PART:
+            block = Block(token, part=read_part(t))
+        elif token == TOK_VARBIT:
+            block = Block(token, read_varbit(br))
+        elif token == TOK_STRING:
+            block = Block(token, value_str=read_b4string(br))
         else:
-            trailing_terminators = 0
-
-        if token == Token.TOK_VARINT:
-            block.value = read_varint(br)
-        elif token == Token.TOK_VARBIT:
-            block.value = read_varbit(br)
-        elif token == Token.TOK_PART:
-            block.part = read_part(t)
-        elif token == Token.TOK_STRING:
-            block.value_str = read_b4string(br)
-        
-        blocks.append(block)
-
-    # Sanitization: we probably read the zero-padding as terminators.
-    # Only one terminator is needed, remove the extra ones
-    if trailing_terminators > 1:
-        blocks = blocks[:-(trailing_terminators - 1)]
-
-    return blocks, t.done_string(), None
+            block = Block(token)
+
+        yield block, None
+
+    # Sanitization: only one trailing terminator is needed, drop the extra ones
+    if pending_terminators:
+        yield Block(Token.TOK_SEP1), None
+
+def iter_blocks(data: bytes) -> Iterator[Block]:
+    """
+    Lazily deserializes data, yielding each Block as soon as it is read.
+    Callers that only need the header can stop iterating early and the
+    rest of the item is never parsed.
+    """
+    t = Tokenizer(data)
+    _expect_magic(t)
+
+    for block, err in _read_blocks(t):
+        if err:
+            raise err
+        yield block
+
+def _deserialize_into(data: bytes, debug: bool, out) -> (str, Optional[Exception]):
+    t = Tokenizer(data, debug)
+
+    def debug_string() -> str:
+        return t.done_string() if debug else ""
+
+    try:
+        _expect_magic(t)
+    except (IOError, EOFError) as e:
+        return debug_string(), e
+
+    for block, err in _read_blocks(t):
+        if err:
+            return debug_string(), err
+        out.append(block)
+
+    return debug_string(), None
+
+def deserialize(data: bytes, debug: bool = False) -> (list[Block], str, Optional[Exception]):
+    """
+    Deserializes data into blocks. The second value is the bit string split
+    at every token, only rendered when debug is set (empty otherwise).
+    """
+    blocks = []
+    debug_str, err = _deserialize_into(data, debug, blocks)
+    if err:
+        return [], debug_str, err
+    return blocks, debug_str, None
+
+def deserialize_stream(data: bytes, debug: bool = False) -> (BlockStream, str, Optional[Exception]):
+    """Same as deserialize(), but stores the blocks in a compact BlockStream."""
+    stream = BlockStream()
+    debug_str, err = _deserialize_into(data, debug, stream)
+    if err:
+        return BlockStream(), debug_str, err
+    return stream, debug_str, None
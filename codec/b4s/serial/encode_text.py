@@ -0,0 +1,70 @@
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.from_string import (
+    from_string, _token_error, _part_error,
+    _TOKEN_RE, _PART_RE, _LIST_ITEM_RE, _NUMBER, _SEP1, _SEP2, _PART, _STRING,
+)
+from codec.b4s.serial.serialize import serialize
+from codec.b4s.serial_datatypes.b4string.write import write_b4string
+from codec.b4s.serial_datatypes.part.cache import part_bits
+from codec.b4s.serial_datatypes.part.part import SUBTYPE_NONE, SUBTYPE_INT, SUBTYPE_LIST
+from codec.b4s.serial_datatypes.part.pattern import best_pattern_for_value
+from codec.lib.bit.writer import Writer
+
+# Output bytes per input character, used to pre-size the writer
+_BYTES_PER_CHAR_HINT = 0.5
+
+def encode_text(s: str) -> str:
+    """
+    Encodes a decoded item string straight to a Base85 serial.
+    Same output and errors as encode(serialize(from_string(s))), but the
+    bits are written while parsing, without building Block or Part objects.
+    """
+    return encode(serialize_text(s))
+
+def serialize_text(s: str) -> bytearray:
+    """The serialized data encode_text() encodes, same as serialize(from_string(s))."""
+    bw = Writer(int(len(s) * _BYTES_PER_CHAR_HINT))
+    write_n = bw.write_n
+    write_n(0b0010000, 7)
+
+    match = _TOKEN_RE.match
+    i = 0
+    n = len(s)
+    while i < n:
+        m = match(s, i)
+        if m is None:
+            raise _token_error(s, i)
+
+        kind = m.lastindex
+        if kind == _NUMBER:
+            write_n(*best_pattern_for_value(int(m.group(_NUMBER))))
+        elif kind == _SEP2:
+            write_n(0b01, 2)
+        elif kind == _PART:
+            part_str = m.group(_PART)
+            pm = _PART_RE.fullmatch(part_str, 1, len(part_str) - 1)
+            if pm is None:
+                raise _part_error(part_str, i)
+
+            index, value, list_str = pm.groups()
+            if list_str is not None:
+                entry = part_bits(int(index), SUBTYPE_LIST, tuple(map(int, _LIST_ITEM_RE.findall(list_str))))
+            elif value is not None:
+                entry = part_bits(int(index), SUBTYPE_INT, int(value))
+            else:
+                entry = part_bits(int(index), SUBTYPE_NONE, None)
+            write_n((0b101 << entry.length) | entry.bits, entry.length + 3)
+        elif kind == _SEP1:
+            write_n(0b00, 2)
+        elif kind == _STRING:
+            str_content = m.group(_STRING).replace('\\"', '"').replace('\\\\', '\\')
+            if not str_content.isascii():
+                # Only 7-bit characters can be written; the block pipeline
+                # parses everything first, so defer to it for the exact error
+                return serialize(from_string(s))
+            write_n(0b111, 3)
+            write_b4string(bw, str_content)
+
+        i = m.end()
+
+    return bw.get_data()
@@ -0,0 +1,49 @@
+from typing import Sequence
+from codec.b4s.serial.block import Block
+from codec.b4s.serial_datatypes.part.cache import text_for_part
+from codec.b4s.serial_tokenizer.tokenizer import Token, TOK_SEP1, TOK_SEP2, TOK_VARINT, TOK_VARBIT, TOK_PART, TOK_STRING
+
+_STRING_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"'})
+
+_DATA_TOKENS = (TOK_VARINT, TOK_VARBIT, TOK_PART, TOK_STRING)
+
+def _spacing(token: int, next_token: int) -> str:
+    # A space between two data blocks, after every ',' and after a '|'
+    # unless another '|' follows
+    if token in _DATA_TOKENS:
+        return " " if next_token in _DATA_TOKENS else ""
+    if token == TOK_SEP2:
+        return " "
+    return " " if next_token != TOK_SEP1 else ""
+
+# SPACING[token][next_token] is the text put between two adjacent blocks
+SPACING = tuple(tuple(_spacing(a, b) for b in Token) for a in Token)
+
+def render_block(block: Block) -> str:
+    """Text of a single block, without the spacing around it."""
+    token = block.token
+    if token == TOK_PART:
+        return text_for_part(block.part)
+    if token == TOK_VARINT or token == TOK_VARBIT:
+        return str(block.value)
+    if token == TOK_SEP1:
+        return "|"
+    if token == TOK_SEP2:
+        return ","
+    if token == TOK_STRING:
+        return f'"{block.value_str.translate(_STRING_ESCAPES)}"'
+    return ""
+
+def format_blocks(blocks: Sequence[Block]) -> str:
+    """
+    Formats blocks into the human-readable item string.
+    Example output: '8, 0, 1, 50| 2, 1570|| {53} {2} ...'
+    """
+    tokens = [block.token for block in blocks]
+    spaces = [SPACING[a][b] for a, b in zip(tokens, tokens[1:])]
+    spaces.append("")
+    return "".join(render_block(block) + space for block, space in zip(blocks, spaces))
+
+def canonical_string(blocks: Sequence[Block]) -> str:
+    """Same as format_blocks(), without the cosmetic spaces."""
+    return "".join(map(render_block, blocks))
@@ -2,176 +2,91 @@ import re
 from codec.b4s.serial.block import Block
 from codec.b4s.serial_datatypes.part.part import Part, PartSubType
 from codec.b4s.serial_tokenizer.tokenizer import Token
-from codec.lib.bit.writer import Writer
-from codec.b4s.serial_datatypes.varint.write import write as write_varint
-from codec.b4s.serial_datatypes.varbit.write import write as write_varbit
-
-def is_numbers(s: str) -> (int, bool):
-    s = s.strip()
-    if not s.isdigit():
-        return 0, False
-    return int(s), True
-
-def is_part_simple(s: str) -> (int, bool):
-    s = s.strip()
-    if not s.startswith('{') or not s.endswith('}'):
-        return 0, False
-    return is_numbers(s[1:-1])
-
-def is_part_subtype_int(s: str) -> (int, int, bool):
-    s = s.strip()
-    if not s.startswith('{') or not s.endswith('}'):
-        return 0, 0, False
-    
-    middle = s[1:-1].strip()
-    parts = middle.split(':')
-    if len(parts) != 2:
-        return 0, 0, False
-        
-    index, ok = is_numbers(parts[0])
-    if not ok:
-        return 0, 0, False
-    
-    value, ok = is_numbers(parts[1])
-    if not ok:
-        return 0, 0, False
-        
-    return index, value, True
-
-def is_part_subtype_list(s: str) -> (int, list[int], bool):
-    s = s.strip()
-    if not s.startswith('{') or not s.endswith('}'):
-        return 0, None, False
-        
-    middle = s[1:-1].strip()
-    parts = middle.split(':')
-    if len(parts) < 2:
-        return 0, None, False
-        
-    index, ok = is_numbers(parts[0])
-    if not ok:
-        return 0, None, False
-        
-    list_str = parts[1].strip()
-    if not list_str.startswith('[') or not list_str.endswith(']'):
-        return 0, None, False
-        
-    list_str = list_str[1:-1].strip()
-    
-    values = []
-    for num_str in re.split(r'[\s,]+', list_str):
-        if not num_str:
-            continue
-        v, ok = is_numbers(num_str)
-        if not ok:
-            return 0, None, False
-        values.append(v)
-        
-    return index, values, True
+from codec.b4s.serial_datatypes.varint.write import pattern as varint_pattern
+from codec.b4s.serial_datatypes.varbit.write import pattern as varbit_pattern
+
+# One alternative per token kind, matched at the current position.
+# The group numbers are used for dispatch in from_string().
+_TOKEN_RE = re.compile(
+    r'(\s+)'                    # 1: whitespace
+    r'|(\|)'                    # 2: TOK_SEP1
+    r'|(,)'                     # 3: TOK_SEP2
+    r'|(\d+)'                   # 4: number
+    r'|(\{[^}]*\})'             # 5: part, up to the first '}'
+    r'|"(.*?)(?<!\\)"',         # 6: string, up to the first unescaped '"'
+    re.DOTALL,
+)
+_WS, _SEP1, _SEP2, _NUMBER, _PART, _STRING = range(1, 7)
+
+# Contents of a part between the braces:
+#   {index}, {index:value} or {index:[values]}
+# A list may be followed by ':' and anything else, which is ignored.
+_PART_RE = re.compile(
+    r'\s*(\d+)\s*'
+    r'(?::\s*(?:'
+    r'(\d+)\s*'
+    r'|\[([\d\s,]*)\]\s*(?::.*)?'
+    r'))?',
+    re.DOTALL,
+)
+_LIST_ITEM_RE = re.compile(r'\d+')
 
 def best_type_for_value(v: int) -> Token:
-    bw_varint = Writer()
-    write_varint(bw_varint, v)
-
-    bw_varbit = Writer()
-    write_varbit(bw_varbit, v)
-
-    if bw_varint.get_pos() > bw_varbit.get_pos():
+    if varint_pattern(v)[1] > varbit_pattern(v)[1]:
         return Token.TOK_VARBIT
     else:
         return Token.TOK_VARINT
 
+def _token_error(s: str, pos: int) -> ValueError:
+    """Error for text at pos that doesn't start any token."""
+    char = s[pos]
+    if char == '{':
+        return ValueError(f"Unmatched '{{' at position {pos}")
+    if char == '"':
+        return ValueError(f"Unmatched '\"' at position {pos}")
+    return ValueError(f"Invalid character: '{char}' at position {pos}")
+
+def _part_error(part_str: str, pos: int) -> ValueError:
+    return ValueError(f"Invalid part format: '{part_str}' at position {pos}")
+
+def _parse_part(part_str: str, pos: int) -> Part:
+    m = _PART_RE.fullmatch(part_str, 1, len(part_str) - 1)
+    if m is None:
+        raise _part_error(part_str, pos)
+
+    index, value, list_str = m.groups()
+    if list_str is not None:
+        return Part(int(index), PartSubType.SUBTYPE_LIST, values=[int(v) for v in _LIST_ITEM_RE.findall(list_str)])
+    if value is not None:
+        return Part(int(index), PartSubType.SUBTYPE_INT, int(value))
+    return Part(int(index), PartSubType.SUBTYPE_NONE)
+
 def from_string(s: str) -> list[Block]:
     blocks = []
+    append = blocks.append
+    match = _TOKEN_RE.match
     i = 0
-    while i < len(s):
-        char = s[i]
-
-        if char.isspace():
-            i += 1
-            continue
-        
-        if char == '|':
-            blocks.append(Block(Token.TOK_SEP1))
-            i += 1
-            continue
-
-        if char == ',':
-            blocks.append(Block(Token.TOK_SEP2))
-            i += 1
-            continue
-
-        if char.isdigit():
-            start = i
-            while i < len(s) and s[i].isdigit():
-                i += 1
-            num_str = s[start:i]
-            val, _ = is_numbers(num_str)
-            block = Block(best_type_for_value(val))
-            block.value = val
-            blocks.append(block)
-            continue
-            
-        if char == '{':
-            end = s.find('}', i)
-            if end == -1:
-                raise ValueError(f"Unmatched '{{' at position {i}")
-            
-            part_str = s[i : end+1]
-            i = end + 1
-
-            index, values, ok = is_part_subtype_list(part_str)
-            if ok:
-                part = Part()
-                part.index, part.sub_type, part.values = index, PartSubType.SUBTYPE_LIST, values
-                block = Block(Token.TOK_PART)
-                block.part = part
-                blocks.append(block)
-                continue
-
-            index, value, ok = is_part_subtype_int(part_str)
-            if ok:
-                part = Part()
-                part.index, part.sub_type, part.value = index, PartSubType.SUBTYPE_INT, value
-                block = Block(Token.TOK_PART)
-                block.part = part
-                blocks.append(block)
-                continue
-
-            value, ok = is_part_simple(part_str)
-            if ok:
-                part = Part()
-                part.index, part.sub_type = value, PartSubType.SUBTYPE_NONE
-                block = Block(Token.TOK_PART)
-                block.part = part
-                blocks.append(block)
-                continue
-                
-            raise ValueError(f"Invalid part format: '{part_str}'")
-
-        if char == '"':
-            end = i + 1
-            while end < len(s):
-                if s[end] == '"':
-                    # Look behind for escape character
-                    if s[end-1] != '\\':
-                        break
-                end += 1
-
-            if end >= len(s):
-                raise ValueError(f"Unmatched '\"' at position {i}")
-
-            str_content = s[i+1:end]
-            i = end + 1
-
+    n = len(s)
+    while i < n:
+        m = match(s, i)
+        if m is None:
+            raise _token_error(s, i)
+
+        kind = m.lastindex
+        if kind == _NUMBER:
+            val = int(m.group(_NUMBER))
+            append(Block(best_type_for_value(val), val))
+        elif kind == _SEP2:
+            append(Block(Token.TOK_SEP2))
+        elif kind == _PART:
+            append(Block(Token.TOK_PART, part=_parse_part(m.group(_PART), i)))
+        elif kind == _SEP1:
+            append(Block(Token.TOK_SEP1))
+        elif kind == _STRING:
             # Unescape
-            str_content = str_content.replace('\\"', '"').replace('\\\\', '\\')
-
-            block = Block(Token.TOK_STRING)
-            block.value_str = str_content
-            blocks.append(block)
-            continue
+            str_content = m.group(_STRING).replace('\\"', '"').replace('\\\\', '\\')
+            append(Block(Token.TOK_STRING, value_str=str_content))
 
-        raise ValueError(f"Invalid character: '{char}' at position {i}")
+        i = m.end()
 
     return blocks
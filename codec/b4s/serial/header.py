@@ -0,0 +1,111 @@
+from typing import NamedTuple, Optional
+from codec.b4s.b85.decode import decode_view, DIGIT_TABLE, INVALID_DIGIT
+from codec.b4s.serial.deserialize import iter_blocks
+from codec.b4s.serial_tokenizer.tokenizer import Token
+
+# Base85 characters decoded on the first attempt (multiple of 5, 16 bytes),
+# enough for a typical '7, 0, 1, 50| 2, 3308||' header
+_PEEK_CHARS = 20
+
+# Header group holding the seed, e.g. '| 2, 3308|'
+SEED_GROUP_KEY = 2
+
+class ItemHeader(NamedTuple):
+    type_id: int
+    flags: tuple[int, ...]
+    level: int
+    seed: Optional[int]
+    groups: tuple[tuple[int, ...], ...]  # Every '|' separated header group
+
+def scan_header(blocks) -> Optional[tuple[list[list[int]], list[list[int]], int]]:
+    """
+    Reads the '|' separated header groups from the start of a block stream.
+    Returns (groups, positions, body_start): the values of each group, the
+    index of each value's block, and the index of the first block after the
+    '||'. Returns None if the stream ends before the '||'.
+    Raises ValueError for a token other than a value or separator.
+    """
+    groups = [[]]
+    positions = [[]]
+    prev_sep1 = False
+    for i, block in enumerate(blocks):
+        token = block.token
+        if token == Token.TOK_SEP1:
+            if prev_sep1:
+                # Empty group between the two terminators
+                groups.pop()
+                positions.pop()
+                return groups, positions, i + 1
+            groups.append([])
+            positions.append([])
+            prev_sep1 = True
+            continue
+        prev_sep1 = False
+
+        if token in (Token.TOK_VARINT, Token.TOK_VARBIT):
+            groups[-1].append(block.value)
+            positions[-1].append(i)
+        elif token != Token.TOK_SEP2:
+            raise ValueError(f"Unexpected token {token} in item header")
+    return None
+
+def make_header(groups: list[list[int]]) -> ItemHeader:
+    """ItemHeader for the header groups. Raises ValueError if the first has fewer than 4 values."""
+    first = groups[0]
+    if len(first) < 4:
+        raise ValueError("Header has fewer than 4 values")
+
+    seed = None
+    for group in groups[1:]:
+        if len(group) >= 2 and group[0] == SEED_GROUP_KEY:
+            seed = group[1]
+            break
+
+    return ItemHeader(
+        type_id=first[0],
+        flags=tuple(first[1:3]),
+        level=first[3],
+        seed=seed,
+        groups=tuple(tuple(g) for g in groups),
+    )
+
+def _read_header_groups(data: bytes) -> Optional[list[list[int]]]:
+    """Returns the header groups, or None if data ends before the '||'."""
+    try:
+        scan = scan_header(iter_blocks(data))
+    except (IOError, EOFError):
+        # Truncated value or magic header
+        return None
+    return scan[0] if scan is not None else None
+
+def peek_header(serial: str) -> ItemHeader:
+    """
+    Reads the leading header values of a serial (type id, flags, level, seed)
+    without decoding or parsing the part blocks.
+    Raises ValueError if the serial is invalid or has no '||' header.
+    """
+    if not serial.startswith("@U"):
+        raise ValueError("Not a valid Borderlands 4 item serial")
+
+    try:
+        digits = serial[2:].encode('latin-1').translate(DIGIT_TABLE)
+    except UnicodeEncodeError:
+        raise ValueError("Not a valid Borderlands 4 item serial") from None
+
+    body_len = len(digits)
+    # Whole 5-character groups decode to an exact prefix of the full data.
+    # Characters outside the charset break that, so decode everything then.
+    if INVALID_DIGIT in digits:
+        n_chars = body_len
+    else:
+        n_chars = min(_PEEK_CHARS, body_len)
+
+    while True:
+        groups = _read_header_groups(decode_view(serial[:2 + n_chars]))
+        if groups is not None:
+            break
+        if n_chars >= body_len:
+            raise ValueError("Serial has no complete '||' header")
+        n_chars = min(n_chars * 2, body_len)
+
+    return make_header(groups)
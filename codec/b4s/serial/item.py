@@ -0,0 +1,154 @@
+from typing import Optional
+from codec.b4s.b85.decode import decode_view
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.block import Block
+from codec.b4s.serial.deserialize import deserialize
+from codec.b4s.serial.formatter import format_blocks
+from codec.b4s.serial.from_string import from_string, best_type_for_value
+from codec.b4s.serial.header import ItemHeader, SEED_GROUP_KEY, scan_header, make_header
+from codec.b4s.serial.serialize import serialize
+from codec.b4s.serial_datatypes.part.part import Part
+from codec.b4s.serial_tokenizer.tokenizer import Token
+
+# Position of the level in the first header group: 'type_id, flag, flag, level|'
+LEVEL_POSITION = 3
+
+class DecodedItem:
+    """
+    An item serial decoded into its header fields and blocks.
+
+    Header edits (level, seed) replace the one block holding the value, the
+    rest of the blocks are kept as decoded. blocks, body_blocks and parts
+    return copies, edit the item through its setters. The item string is
+    rendered on first use of text. Items without a '<values>||' header still
+    decode, their header fields are None.
+    """
+    __slots__ = ("_blocks", "_groups", "_positions", "_body_start", "_text")
+
+    def __init__(self, blocks, text: Optional[str] = None):
+        # Edits replace blocks instead of changing them, so the caller's blocks stay as they are
+        self._blocks: list[Block] = list(blocks)
+        self._text = text
+        self._groups = self._positions = None
+        self._body_start = 0
+        try:
+            scan = scan_header(self._blocks)
+        except ValueError:
+            scan = None
+        if scan is not None and len(scan[0][0]) > LEVEL_POSITION:
+            self._groups, self._positions, self._body_start = scan
+
+    @classmethod
+    def from_serial(cls, serial: str) -> "DecodedItem":
+        """Raises ValueError (or IOError/EOFError) if the serial doesn't decode."""
+        if not serial.startswith("@U"):
+            raise ValueError("Not a valid Borderlands 4 item serial")
+        blocks, _, err = deserialize(decode_view(serial))
+        if err:
+            raise err
+        return cls(blocks)
+
+    @classmethod
+    def from_string(cls, s: str) -> "DecodedItem":
+        """Parses an item string such as '7, 0, 1, 50| 2, 3308|| {1} {2}|'."""
+        return cls(from_string(s))
+
+    # --- Header ---
+
+    @property
+    def header(self) -> Optional[ItemHeader]:
+        return make_header(self._groups) if self._groups is not None else None
+
+    @property
+    def type_id(self) -> Optional[int]:
+        return self._groups[0][0] if self._groups is not None else None
+
+    @property
+    def flags(self) -> Optional[tuple[int, ...]]:
+        return tuple(self._groups[0][1:LEVEL_POSITION]) if self._groups is not None else None
+
+    @property
+    def level(self) -> Optional[int]:
+        return self._groups[0][LEVEL_POSITION] if self._groups is not None else None
+
+    @level.setter
+    def level(self, value: int):
+        self._require_header()
+        self._set_header_value(0, LEVEL_POSITION, value)
+
+    @property
+    def seed(self) -> Optional[int]:
+        group = self._seed_group()
+        return self._groups[group][1] if group is not None else None
+
+    @seed.setter
+    def seed(self, value: int):
+        self._require_header()
+        group = self._seed_group()
+        if group is None:
+            raise ValueError("Item header has no seed group")
+        self._set_header_value(group, 1, value)
+
+    @property
+    def groups(self) -> Optional[tuple[tuple[int, ...], ...]]:
+        """Every '|' separated header group."""
+        return tuple(tuple(g) for g in self._groups) if self._groups is not None else None
+
+    def _require_header(self):
+        if self._groups is None:
+            raise ValueError("Item has no '||' header")
+
+    def _seed_group(self) -> Optional[int]:
+        if self._groups is None:
+            return None
+        for i, group in enumerate(self._groups[1:], 1):
+            if len(group) >= 2 and group[0] == SEED_GROUP_KEY:
+                return i
+        return None
+
+    def _set_header_value(self, group: int, position: int, value: int):
+        if value < 0:
+            raise ValueError(f"Header values can't be negative: {value}")
+        if self._groups[group][position] == value:
+            return
+        self._blocks[self._positions[group][position]] = Block(best_type_for_value(value), value)
+        self._groups[group][position] = value
+        self._text = None
+
+    # --- Body ---
+
+    @property
+    def blocks(self) -> tuple[Block, ...]:
+        return tuple(b.copy() for b in self._blocks)
+
+    @property
+    def body_blocks(self) -> tuple[Block, ...]:
+        """The blocks after the '||' header (all of them if there is none)."""
+        return tuple(b.copy() for b in self._blocks[self._body_start:])
+
+    @property
+    def parts(self) -> list[Part]:
+        return [b.part.copy() for b in self._blocks[self._body_start:] if b.token == Token.TOK_PART]
+
+    # --- Output ---
+
+    @property
+    def text(self) -> str:
+        """The item string, e.g. '7, 0, 1, 50| 2, 3308|| {1} {2}|'."""
+        if self._text is None:
+            self._text = format_blocks(self._blocks)
+        return self._text
+
+    @property
+    def parts_text(self) -> str:
+        """The item string after the '||', stripped."""
+        text = self.text
+        if self._groups is None or "||" not in text:
+            return text.strip()
+        return text.split("||", 1)[1].strip()
+
+    def to_serial(self) -> str:
+        return encode(serialize(self._blocks))
+
+    def __repr__(self):
+        return f"DecodedItem({self.text!r})"
@@ -0,0 +1,182 @@
+from typing import Optional
+from codec.b4s.b85.decode import decode_view, DIGIT_TABLE, INVALID_DIGIT
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial_datatypes.b4string.read import read_b4string
+from codec.b4s.serial_datatypes.part.pattern import best_pattern_for_value
+from codec.b4s.serial_datatypes.part.read import read_part
+from codec.b4s.serial_datatypes.varbit.read import read_varbit
+from codec.b4s.serial_datatypes.varint.read import read_varint
+from codec.b4s.serial_tokenizer.tokenizer import (
+    Tokenizer, TOK_SEP1, TOK_SEP2, TOK_VARINT, TOK_VARBIT, TOK_PART, TOK_STRING,
+)
+
+# Position of the level in the first header group: 'type_id, flag, flag, level|'
+LEVEL_POSITION = 3
+
+# A Base85 group is 5 characters for 4 bytes
+_GROUP_CHARS = 5
+_GROUP_BITS = 32
+
+def _level_span(data) -> Optional[tuple[int, int, int]]:
+    """
+    Scans the header of data for the level. Returns (start, end, value) with
+    the bit span of its token and payload, or None if data ends before the '||'.
+    Raises ValueError if the header is invalid.
+    """
+    t = Tokenizer(data)
+    br = t.bit_reader()
+    span = None
+    group = 0
+    n_values = 0
+    prev_sep1 = False
+    closed = False
+    try:
+        t.expect("magic header", 0, 0, 1, 0, 0, 0, 0)
+        while True:
+            start = br.pos
+            token = t.next_token()
+            if closed:
+                # Terminators at the very end are padding and the '||' only
+                # counts once something follows it, like deserialize() reads it
+                if token != TOK_SEP1:
+                    break
+                continue
+            if token == TOK_SEP1:
+                if prev_sep1:
+                    closed = True
+                    continue
+                group += 1
+                prev_sep1 = True
+                continue
+            prev_sep1 = False
+
+            if token == TOK_VARINT:
+                value = read_varint(br)
+            elif token == TOK_VARBIT:
+                value = read_varbit(br)
+            elif token == TOK_SEP2:
+                continue
+            else:
+                raise ValueError(f"Unexpected token {token} in item header")
+
+            if group == 0:
+                if n_values == LEVEL_POSITION:
+                    span = (start, br.pos, value)
+                n_values += 1
+    except (IOError, EOFError):
+        # Truncated value or magic header
+        return None
+
+    if span is None:
+        raise ValueError("Header has fewer than 4 values")
+    return span
+
+def _content_end(data, pos: int) -> int:
+    """
+    Bit position where the blocks of data end, reading from the block boundary
+    pos. Terminators after the first one past the last block are padding, the
+    same as deserialize() drops them.
+    """
+    t = Tokenizer(data)
+    br = t.bit_reader()
+    br.pos = pos
+    end = pos
+    sep1_end = None
+    try:
+        while True:
+            try:
+                token = t.next_token()
+            except EOFError:
+                break
+            if token == TOK_SEP1:
+                if sep1_end is None:
+                    sep1_end = br.pos
+                continue
+
+            if token == TOK_VARINT:
+                read_varint(br)
+            elif token == TOK_VARBIT:
+                read_varbit(br)
+            elif token == TOK_PART:
+                read_part(t)
+            elif token == TOK_STRING:
+                read_b4string(br)
+            end = br.pos
+            sep1_end = None
+    except (IOError, EOFError) as e:
+        raise ValueError(f"Serial doesn't decode: {e}") from None
+    return sep1_end if sep1_end is not None else end
+
+def _splice(data, start: int, end: int, bits: int, length: int, stop: int) -> bytes:
+    """
+    Replaces bits [start, end) of data with the length bits in bits and keeps
+    the bits up to stop after them, zero-padded to a whole byte.
+    """
+    total = len(data) * 8
+    value = int.from_bytes(data, 'big')
+    tail_length = stop - end
+    tail = (value >> (total - stop)) & ((1 << tail_length) - 1)
+    value = (((value >> (total - start) << length) | bits) << tail_length) | tail
+
+    n_bits = start + length + tail_length
+    n_bytes = (n_bits + 7) >> 3
+    return (value << (n_bytes * 8 - n_bits)).to_bytes(n_bytes, 'big')
+
+def patch_level(serial: str, new_level: int, validate: bool = False) -> str:
+    """
+    Returns serial with its level (the 4th header value) set to new_level,
+    without rebuilding the item's blocks. Only the header is read unless the
+    new value changes width, then the blocks after it are walked to find
+    where the item ends. With validate set they are always walked, so a
+    serial that doesn't decode is rejected whatever the level.
+    The new value goes in as the same token a full re-encode would pick. If
+    its width is unchanged only the Base85 groups holding it are re-encoded;
+    otherwise the bits after it are shifted and the serial is re-encoded from
+    there.
+    Raises ValueError if the serial is invalid or has no '||' header.
+    """
+    if new_level < 0:
+        raise ValueError(f"Level can't be negative: {new_level}")
+    if not serial.startswith("@U"):
+        raise ValueError("Not a valid Borderlands 4 item serial")
+
+    try:
+        digits = serial[2:].encode('latin-1').translate(DIGIT_TABLE)
+    except UnicodeEncodeError:
+        raise ValueError("Not a valid Borderlands 4 item serial") from None
+
+    data = decode_view(serial)
+    span = _level_span(data)
+    if span is None:
+        raise ValueError("Serial has no complete '||' header")
+    start, end, value = span
+    bits, length = best_pattern_for_value(new_level)
+    stop = None
+    if validate or (value != new_level and length != end - start):
+        # Walks the blocks after the level, raising ValueError if they don't decode
+        stop = _content_end(data, end)
+    if value == new_level:
+        return serial
+
+    # Whole groups decode to an exact prefix of the data and map to their own
+    # characters. Characters outside the charset break both, so re-encode
+    # everything then.
+    aligned = INVALID_DIGIT not in digits
+    first_group = start // _GROUP_BITS if aligned else 0
+    first_char = 2 + first_group * _GROUP_CHARS
+    offset = first_group * _GROUP_BITS
+
+    if length == end - start:
+        if aligned:
+            # Same width: only the groups the value touches change
+            last_group = (end - 1) // _GROUP_BITS
+            groups = data[first_group * 4:(last_group + 1) * 4]
+            patched = _splice(groups, start - offset, end - offset, bits, length, len(groups) * 8)
+            chars = encode(patched)[2:]
+            return serial[:first_char] + chars + serial[first_char + len(chars):]
+        # Nothing moves, keep the padding bits as they are
+        stop = len(data) * 8
+
+    tail = data[first_group * 4:]
+    patched = _splice(tail, start - offset, end - offset, bits, length, stop - offset)
+    return serial[:first_char] + encode(patched)[2:]
@@ -2,29 +2,41 @@ from codec.b4s.serial_datatypes.part.write import write as write_part
 from codec.b4s.serial_datatypes.varbit.write import write as write_varbit
 from codec.b4s.serial_datatypes.varint.write import write as write_varint
 from codec.b4s.serial_datatypes.b4string.write import write_b4string
-from codec.b4s.serial_tokenizer.tokenizer import Token
 from codec.lib.bit.writer import Writer
 from codec.b4s.serial.block import Block
+from codec.b4s.serial.block_stream import BlockStream
 
-def serialize(s: list[Block]) -> bytearray:
-    bw = Writer()
+# Rough bytes-per-block guess used to pre-size the output buffer
+_BYTES_PER_BLOCK_HINT = 2
+
+# Indexed by token code: (token bits, bit count) and the payload writer
+_TOKEN_PREFIX = (
+    (0b00, 2),      # TOK_SEP1
+    (0b01, 2),      # TOK_SEP2
+    (0b100, 3),     # TOK_VARINT
+    (0b110, 3),     # TOK_VARBIT
+    (0b101, 3),     # TOK_PART
+    (0b111, 3),     # TOK_STRING
+)
+_PAYLOAD_WRITERS = (
+    None,
+    None,
+    lambda bw, block: write_varint(bw, block.value),
+    lambda bw, block: write_varbit(bw, block.value),
+    lambda bw, block: write_part(bw, block.part),
+    lambda bw, block: write_b4string(bw, block.value_str),
+)
+
+def serialize(s: list[Block] | BlockStream) -> bytearray:
+    bw = Writer(len(s) * _BYTES_PER_BLOCK_HINT)
     bw.write_bits(0, 0, 1, 0, 0, 0, 0)
+
+    write_n = bw.write_n
     for block in s:
-        if block.token == Token.TOK_SEP1:
-            bw.write_bits(0, 0)
-        elif block.token == Token.TOK_SEP2:
-            bw.write_bits(0, 1)
-        elif block.token == Token.TOK_VARINT:
-            bw.write_bits(1, 0, 0)
-            write_varint(bw, block.value)
-        elif block.token == Token.TOK_VARBIT:
-            bw.write_bits(1, 1, 0)
-            write_varbit(bw, block.value)
-        elif block.token == Token.TOK_PART:
-            bw.write_bits(1, 0, 1)
-            write_part(bw, block.part)
-        elif block.token == Token.TOK_STRING:
-            bw.write_bits(1, 1, 1)
-            write_b4string(bw, block.value_str)
+        token = block.token
+        write_n(*_TOKEN_PREFIX[token])
+        payload_writer = _PAYLOAD_WRITERS[token]
+        if payload_writer is not None:
+            payload_writer(bw, block)
             
     return bw.get_data()
@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import NamedTuple
+from codec.b4s.serial_datatypes.part.part import Part, SUBTYPE_NONE, SUBTYPE_INT, SUBTYPE_LIST
+from codec.b4s.serial_datatypes.part.pattern import part_pattern
+
+# Distinct parts kept per cache; modded items repeat the same few parts hundreds of times
+PART_CACHE_SIZE = 4096
+
+class PartBits(NamedTuple):
+    bits: int    # Serialized part after its TOK_PART token, MSB first
+    length: int  # Number of bits in bits
+
+# Decoding only needs the text and encoding only the bits, so each has its
+# own cache and neither pays for the other on a miss. For both, payload is the
+# value for SUBTYPE_INT, a tuple of the values for SUBTYPE_LIST and None otherwise.
+
+@lru_cache(maxsize=PART_CACHE_SIZE)
+def part_text(index: int, sub_type: int, payload) -> str:
+    """Cached text of a part as in the item string, e.g. '{2:[43 43]}'."""
+    if sub_type == SUBTYPE_NONE:
+        return f"{{{index}}}"
+    if sub_type == SUBTYPE_INT:
+        return f"{{{index}:{payload}}}"
+    if sub_type == SUBTYPE_LIST:
+        return f"{{{index}:[{' '.join(map(str, payload))}]}}"
+    return ""
+
+@lru_cache(maxsize=PART_CACHE_SIZE)
+def part_bits(index: int, sub_type: int, payload) -> PartBits:
+    """Cached bit pattern of a part."""
+    return PartBits(*part_pattern(index, sub_type, payload))
+
+def text_for_part(p: Part) -> str:
+    sub_type = p.sub_type
+    if sub_type == SUBTYPE_LIST:
+        return part_text(p.index, SUBTYPE_LIST, tuple(p.values))
+    if sub_type == SUBTYPE_INT:
+        return part_text(p.index, SUBTYPE_INT, p.value)
+    return part_text(p.index, sub_type, None)
+
+def bits_for_part(p: Part) -> PartBits:
+    sub_type = p.sub_type
+    if sub_type == SUBTYPE_LIST:
+        return part_bits(p.index, SUBTYPE_LIST, tuple(p.values))
+    if sub_type == SUBTYPE_INT:
+        return part_bits(p.index, SUBTYPE_INT, p.value)
+    return part_bits(p.index, sub_type, None)
+
+def clear_part_cache():
+    part_text.cache_clear()
+    part_bits.cache_clear()
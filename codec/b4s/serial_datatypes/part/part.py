@@ -1,13 +1,42 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
-class PartSubType(Enum):
+class PartSubType(IntEnum):
     SUBTYPE_NONE = 0
     SUBTYPE_INT = 1
     SUBTYPE_LIST = 2
 
+    # Keep rendering as 'PartSubType.SUBTYPE_X' in messages
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+
+# Plain int codes for the codec inner loops, PartSubType members compare equal to them
+SUBTYPE_NONE = int(PartSubType.SUBTYPE_NONE)
+SUBTYPE_INT = int(PartSubType.SUBTYPE_INT)
+SUBTYPE_LIST = int(PartSubType.SUBTYPE_LIST)
+
 class Part:
-    def __init__(self):
-        self.index: int = 0
-        self.sub_type: PartSubType = PartSubType.SUBTYPE_NONE
-        self.value: int = 0
-        self.values: list[int] = []
+    __slots__ = ("index", "sub_type", "value", "values")
+
+    def __init__(self, index: int = 0, sub_type: PartSubType = PartSubType.SUBTYPE_NONE,
+                 value: int = 0, values: list[int] = None):
+        self.index: int = index
+        self.sub_type: PartSubType = sub_type
+        self.value: int = value
+        self.values: list[int] = values if values is not None else []
+
+    def __eq__(self, other):
+        if not isinstance(other, Part):
+            return NotImplemented
+        return (self.index == other.index and self.sub_type == other.sub_type
+                and self.value == other.value and self.values == other.values)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return Part, (self.index, self.sub_type, self.value, self.values)
+
+    def copy(self) -> "Part":
+        return Part(self.index, self.sub_type, self.value, list(self.values))
+
+    def __repr__(self):
+        return f"Part({self.index}, {self.sub_type.name}, value={self.value}, values={self.values})"
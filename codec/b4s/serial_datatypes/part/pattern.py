@@ -0,0 +1,60 @@
+from itertools import groupby
+from codec.lib.bit.repeat import repeat_bits
+from codec.b4s.serial_datatypes.varint.write import pattern as varint_pattern
+from codec.b4s.serial_datatypes.varbit.write import pattern as varbit_pattern
+from codec.b4s.serial_datatypes.part.part import SUBTYPE_NONE, SUBTYPE_INT, SUBTYPE_LIST
+
+_TOKEN_BITS_VARINT = 0b100
+_TOKEN_BITS_VARBIT = 0b110
+
+# Token + payload of the shortest encoding for small values, filled on first use
+_BEST_PATTERNS = [None] * (1 << 16)
+
+def _best_pattern(v: int) -> tuple[int, int]:
+    varint_bits, varint_len = varint_pattern(v)
+    varbit_bits, varbit_len = varbit_pattern(v)
+
+    if varint_len > varbit_len:
+        return (_TOKEN_BITS_VARBIT << varbit_len) | varbit_bits, varbit_len + 3
+    else:
+        return (_TOKEN_BITS_VARINT << varint_len) | varint_bits, varint_len + 3
+
+def best_pattern_for_value(v: int) -> tuple[int, int]:
+    """Returns the token and payload bits of the shortest encoding of v as (bits, length)."""
+    if 0 <= v < len(_BEST_PATTERNS):
+        p = _BEST_PATTERNS[v]
+        if p is None:
+            p = _BEST_PATTERNS[v] = _best_pattern(v)
+        return p
+    return _best_pattern(v)
+
+def part_pattern(index: int, sub_type: int, payload) -> tuple[int, int]:
+    """
+    Returns the bits written for a part after its TOK_PART token as (bits, length).
+    payload is the value for SUBTYPE_INT, the sequence of values for SUBTYPE_LIST
+    and ignored otherwise.
+    """
+    bits, length = varint_pattern(index)
+
+    if sub_type == SUBTYPE_NONE:
+        return (bits << 3) | 0b010, length + 3
+    if sub_type == SUBTYPE_INT:
+        value_bits, value_length = varint_pattern(payload)
+        # Int flag, the value, then the 000 terminator
+        return (((bits << 1) | 1) << (value_length + 3)) | (value_bits << 3), length + value_length + 4
+    if sub_type == SUBTYPE_LIST:
+        # List flag, then the TOK_SEP2 opening the list
+        bits = (bits << 5) | 0b00101
+        length += 5
+        # Runs of the same value are encoded once and replicated
+        for v, run in groupby(payload):
+            value_bits, value_length = best_pattern_for_value(v)
+            count = sum(1 for _ in run)
+            if count > 1:
+                value_bits = repeat_bits(value_bits, value_length, count)
+                value_length *= count
+            bits = (bits << value_length) | value_bits
+            length += value_length
+        # TOK_SEP1 closing the list
+        return bits << 2, length + 2
+    return bits, length
@@ -1,7 +1,7 @@
 from codec.b4s.serial_datatypes.part.part import Part, PartSubType
 from codec.b4s.serial_datatypes.varbit.read import read_varbit
 from codec.b4s.serial_datatypes.varint.read import read_varint
-from codec.b4s.serial_tokenizer.tokenizer import Tokenizer, Token
+from codec.b4s.serial_tokenizer.tokenizer import Tokenizer, TOK_SEP1, TOK_SEP2, TOK_VARINT, TOK_VARBIT
 
 def read_part(t: Tokenizer) -> Part:
     br = t.bit_reader()
@@ -35,19 +35,52 @@ def read_part(t: Tokenizer) -> Part:
         p.sub_type = PartSubType.SUBTYPE_LIST
         
         token = t.next_token()
-        if token != Token.TOK_SEP2:
+        if token != TOK_SEP2:
             raise ValueError(f"Expected part list beginning token to be TOK_SEP2, got {token}")
 
+        next_token = t.next_token
+        values = p.values
+        # Skipping repeats hides their tokens from the debug bit string
+        skip_repeats = not t.debug
+        # Since the last skipped run: bit position of each value, and the
+        # index of the last occurrence of each value
+        base = 0
+        starts = []
+        last_seen = {}
         while True:
-            token = t.next_token()
+            start = br.pos
+            token = next_token()
 
-            if token == Token.TOK_SEP1:
+            if token == TOK_VARINT:
+                value = read_varint(br)
+            elif token == TOK_SEP1:
                 return p
-            elif token == Token.TOK_VARINT:
-                p.values.append(read_varint(br))
-            elif token == Token.TOK_VARBIT:
-                p.values.append(read_varbit(br))
+            elif token == TOK_VARBIT:
+                value = read_varbit(br)
             else:
                 raise ValueError(f"Unexpected token {token} while reading part list item")
 
+            i = len(values)
+            values.append(value)
+            if not skip_repeats:
+                continue
+
+            starts.append(start)
+            j = last_seen.get(value)
+            last_seen[value] = i
+            if j is None:
+                continue
+
+            # values[j + 1:i + 1] may repeat right after this value (a run of one
+            # value when j == i - 1). Identical bits decode to identical values,
+            # so take every following copy of their bits at once.
+            window_start = starts[j + 1 - base]
+            repeats = br.count_repeats(window_start)
+            if repeats:
+                values.extend(values[j + 1:i + 1] * repeats)
+                br.pos += repeats * (br.pos - window_start)
+                base = len(values)
+                starts = []
+                last_seen = {}
+
     raise ValueError(f"ERROR: unknown part flagType2 {flag_type2:02b}")
@@ -1,36 +1,13 @@
 from codec.lib.bit.writer import Writer
-from codec.b4s.serial_datatypes.varint.write import write as write_varint
-from codec.b4s.serial_datatypes.varbit.write import write as write_varbit
-from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+from codec.b4s.serial_datatypes.part.part import Part
+from codec.b4s.serial_datatypes.part.pattern import best_pattern_for_value
+from codec.b4s.serial_datatypes.part.cache import bits_for_part
 
 def best_type_for_value(v: int) -> (tuple[int, ...], tuple[int, ...]):
-    bw_varint = Writer()
-    write_varint(bw_varint, v)
-
-    bw_varbit = Writer()
-    write_varbit(bw_varbit, v)
-
-    if bw_varint.get_pos() > bw_varbit.get_pos():
-        return (1, 1, 0), bw_varbit.get_bits()
-    else:
-        return (1, 0, 0), bw_varint.get_bits()
+    bits, length = best_pattern_for_value(v)
+    all_bits = tuple(map(int, format(bits, f"0{length}b")))
+    return all_bits[:3], all_bits[3:]
 
 def write(bw: Writer, p: Part):
-    write_varint(bw, p.index)
-
-    if p.sub_type == PartSubType.SUBTYPE_NONE:
-        bw.write_bits(0, 1, 0)
-    elif p.sub_type == PartSubType.SUBTYPE_INT:
-        bw.write_bit(1)
-        write_varint(bw, p.value)
-        bw.write_bits(0, 0, 0)
-    elif p.sub_type == PartSubType.SUBTYPE_LIST:
-        bw.write_bits(0, 0, 1)
-        bw.write_bits(0, 1)
-
-        for v in p.values:
-            type_bits, value_bits = best_type_for_value(v)
-            bw.write_bits(*type_bits)
-            bw.write_bits(*value_bits)
-
-        bw.write_bits(0, 0)
+    entry = bits_for_part(p)
+    bw.write_n(entry.bits, entry.length)
@@ -1,9 +1,10 @@
+from codec import speedups
 from codec.lib.bit.reader import BitReader
 from codec.lib.byte_mirror import UINT5_MIRROR
 
 VARBIT_LENGTH_BLOCK_SIZE = 5
 
-def read_varbit(br: BitReader) -> int:
+def _read_varbit_py(br: BitReader) -> int:
     length, ok = br.read_n(VARBIT_LENGTH_BLOCK_SIZE)
     if not ok:
         raise IOError("Unexpected end of data while reading varbit length")
@@ -24,3 +25,13 @@ def read_varbit(br: BitReader) -> int:
         v |= bit << i
         
     return v
+
+def _read_varbit_compiled(br: BitReader) -> int:
+    result = speedups.read_varbit(br.data, br.pos)
+    if result is None:
+        # Let the Python reader raise the matching error
+        return _read_varbit_py(br)
+    value, br.pos = result
+    return value
+
+read_varbit = _read_varbit_compiled if speedups is not None else _read_varbit_py
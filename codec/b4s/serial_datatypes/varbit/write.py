@@ -1,14 +1,32 @@
 from codec.lib.bit.writer import Writer
+from codec.lib.byte_mirror import UINT5_MIRROR
 from codec.lib.int_bits_size import int_bits_size
 from codec.b4s.serial_datatypes.varbit.read import VARBIT_LENGTH_BLOCK_SIZE
 
-def write(bw: Writer, value: int):
+VARBIT_CACHED_BITS = 16
+
+# (bits, length) of every value below 2^VARBIT_CACHED_BITS,
+# filled in the first time the value is encoded
+_PATTERNS = [None] * (1 << VARBIT_CACHED_BITS)
+
+def _encode(value: int) -> tuple[int, int]:
     n_bits = int_bits_size(value, 0, (1 << VARBIT_LENGTH_BLOCK_SIZE) - 1)
 
-    length_bits = n_bits
-    for _ in range(VARBIT_LENGTH_BLOCK_SIZE):
-        bw.write_bit(length_bits & 0b1)
-        length_bits >>= 1
+    # Length then value, both written LSB first
+    bits = UINT5_MIRROR[n_bits]
+    if n_bits > 0:
+        bits = (bits << n_bits) | int(format(value & ((1 << n_bits) - 1), f"0{n_bits}b")[::-1], 2)
+    return bits, VARBIT_LENGTH_BLOCK_SIZE + n_bits
 
-    for i in range(n_bits):
-        bw.write_bit((value >> i) & 0b1)
+def pattern(value: int) -> tuple[int, int]:
+    """Returns the varbit encoding of value as (bits, length), MSB first."""
+    if 0 <= value < len(_PATTERNS):
+        p = _PATTERNS[value]
+        if p is None:
+            p = _PATTERNS[value] = _encode(value)
+        return p
+    return _encode(value)
+
+def write(bw: Writer, value: int):
+    bits, length = pattern(value)
+    bw.write_n(bits, length)
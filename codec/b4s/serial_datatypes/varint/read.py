@@ -1,28 +1,42 @@
+from codec import speedups
 from codec.lib.bit.reader import BitReader
 from codec.lib.byte_mirror import UINT4_MIRROR
 
 VARINT_NB_BLOCKS = 4
 VARINT_BITS_PER_BLOCK = 4
 
-def read_varint(br: BitReader) -> int:
+# A block is a nibble plus its continuation bit. Indexed by the 5 raw bits,
+# gives (mirrored nibble, continuation flag).
+VARINT_BLOCK_SIZE = VARINT_BITS_PER_BLOCK + 1
+VARINT_BLOCKS = tuple((UINT4_MIRROR[b >> 1], b & 1) for b in range(1 << VARINT_BLOCK_SIZE))
+
+def _read_varint_py(br: BitReader) -> int:
     data_read = 0
     output = 0
     
     for _ in range(VARINT_NB_BLOCKS):
-        # Read standard block
-        block32, ok = br.read_n(VARINT_BITS_PER_BLOCK)
+        block, ok = br.read_n(VARINT_BLOCK_SIZE)
         if not ok:
+            _, nibble_ok = br.read_n(VARINT_BITS_PER_BLOCK)
+            if nibble_ok:
+                raise IOError("Unexpected end of data while reading varint continuation bit")
             raise IOError("Unexpected end of data while reading varint")
-        
-        output |= UINT4_MIRROR[block32] << data_read
+
+        nibble, cont = VARINT_BLOCKS[block]
+        output |= nibble << data_read
         data_read += VARINT_BITS_PER_BLOCK
-        
-        # Continuation bit
-        cont, ok = br.read()
-        if not ok:
-            raise IOError("Unexpected end of data while reading varint continuation bit")
-            
+
         if cont == 0:
             break
             
     return output
+
+def _read_varint_compiled(br: BitReader) -> int:
+    result = speedups.read_varint(br.data, br.pos)
+    if result is None:
+        # Let the Python reader raise the matching error
+        return _read_varint_py(br)
+    value, br.pos = result
+    return value
+
+read_varint = _read_varint_compiled if speedups is not None else _read_varint_py
@@ -1,31 +1,41 @@
 from codec.lib.bit.writer import Writer
+from codec.lib.byte_mirror import UINT4_MIRROR
 
 VARINT_BITS_PER_BLOCK = 4
 VARINT_MAX_USABLE_BITS = 16
 
-def write(bw: Writer, value: int):
-    n_bits = 0
-    if value > 0:
-        n_bits = value.bit_length()
-    else:
-        n_bits = 1
+# (bits, length) of every value that fits in VARINT_MAX_USABLE_BITS,
+# filled in the first time the value is encoded
+_PATTERNS = [None] * (1 << VARINT_MAX_USABLE_BITS)
 
+def _encode(value: int) -> tuple[int, int]:
+    n_bits = value.bit_length() if value > 0 else 1
     if n_bits > VARINT_MAX_USABLE_BITS:
         n_bits = VARINT_MAX_USABLE_BITS
 
-    while n_bits > VARINT_BITS_PER_BLOCK:
-        for _ in range(VARINT_BITS_PER_BLOCK):
-            bw.write_bit(value & 0b1)
-            value >>= 1
-            n_bits -= 1
-        bw.write_bit(1)
+    bits = 0
+    length = 0
+    while True:
+        # Each block is the nibble written LSB first, then the continuation bit.
+        # The last block only carries the remaining n_bits, zero-filled.
+        more = n_bits > VARINT_BITS_PER_BLOCK
+        nibble = value & (0xF if more else (1 << n_bits) - 1)
+        bits = (bits << (VARINT_BITS_PER_BLOCK + 1)) | (UINT4_MIRROR[nibble] << 1) | more
+        length += VARINT_BITS_PER_BLOCK + 1
+        if not more:
+            return bits, length
+        value >>= VARINT_BITS_PER_BLOCK
+        n_bits -= VARINT_BITS_PER_BLOCK
+
+def pattern(value: int) -> tuple[int, int]:
+    """Returns the varint encoding of value as (bits, length), MSB first."""
+    if 0 <= value < len(_PATTERNS):
+        p = _PATTERNS[value]
+        if p is None:
+            p = _PATTERNS[value] = _encode(value)
+        return p
+    return _encode(value)
 
-    if n_bits > 0:
-        for i in range(VARINT_BITS_PER_BLOCK):
-            if n_bits > 0:
-                bw.write_bit(value & 0b1)
-                value >>= 1
-                n_bits -= 1
-            else:
-                bw.write_bit(0)
-        bw.write_bit(0)
+def write(bw: Writer, value: int):
+    bits, length = pattern(value)
+    bw.write_n(bits, length)
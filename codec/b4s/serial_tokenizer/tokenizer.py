@@ -1,7 +1,7 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from codec.lib.bit.reader import BitReader
 
-class Token(Enum):
+class Token(IntEnum):
     TOK_SEP1 = 0            # "00" hard separator (terminator?)
     TOK_SEP2 = 1            # "01" soft separator
     TOK_VARINT = 2          # "100" ... nibble varint
@@ -9,50 +9,65 @@ class Token(Enum):
     TOK_PART = 4            # "101" ... complex part block
     TOK_STRING = 5          # "111" is just a b4string after all
 
+    # Keep rendering as 'Token.TOK_X' in messages
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+
+# Plain int codes for the codec inner loops, Token members compare equal to them
+TOK_SEP1 = int(Token.TOK_SEP1)
+TOK_SEP2 = int(Token.TOK_SEP2)
+TOK_VARINT = int(Token.TOK_VARINT)
+TOK_VARBIT = int(Token.TOK_VARBIT)
+TOK_PART = int(Token.TOK_PART)
+TOK_STRING = int(Token.TOK_STRING)
+
+# Token for every 3-bit prefix. Separators only use the first 2 bits.
+TOKENS_BY_BITS = (
+    Token.TOK_SEP1, Token.TOK_SEP1,     # 00x
+    Token.TOK_SEP2, Token.TOK_SEP2,     # 01x
+    Token.TOK_VARINT,                   # 100
+    Token.TOK_PART,                     # 101
+    Token.TOK_VARBIT,                   # 110
+    Token.TOK_STRING,                   # 111
+)
+
 class Tokenizer:
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes, debug: bool = False):
         self.br = BitReader(data)
+        # Token start positions are only tracked for done_string() in debug mode
+        self.debug = debug
         self.split_positions = []
 
     def done_string(self) -> str:
-        splitted = self.br.full_string()
-        for pos in sorted(self.split_positions, reverse=True):
-            splitted = splitted[:pos] + "  " + splitted[pos:]
-        return splitted
+        bits = self.br.full_string()
+        pieces = []
+        prev = 0
+        for pos in sorted(self.split_positions):
+            pieces.append(bits[prev:pos])
+            prev = pos
+        pieces.append(bits[prev:])
+        return "  ".join(pieces)
 
     def bit_reader(self) -> BitReader:
         return self.br
 
     def next_token(self) -> Token:
-        self.split_positions.append(self.br.get_pos())
-
-        b1, b2, ok = self.br.read2()
-        if not ok:
-            raise EOFError("End of stream while reading token")
+        br = self.br
+        if self.debug:
+            self.split_positions.append(br.pos)
 
-        tok = (b1 << 1) | b2
-        if tok == 0b00:
-            return Token.TOK_SEP1
-        if tok == 0b01:
-            return Token.TOK_SEP2
+        tok, ok = br.read_n(3)
+        if ok:
+            if tok < 0b100:
+                # Separators are only 2 bits long
+                br.pos -= 1
+            return TOKENS_BY_BITS[tok]
 
-        b3, ok = self.br.read()
-        if not ok:
+        # Fewer than 3 bits left, only a separator can fit
+        b1, b2, ok = br.read2()
+        if not ok or b1 == 1:
             raise EOFError("End of stream while reading token")
-        
-        tok = (tok << 1) | b3
-        
-        if tok == 0b100:
-            return Token.TOK_VARINT
-        if tok == 0b110:
-            return Token.TOK_VARBIT
-        if tok == 0b101:
-            return Token.TOK_PART
-        if tok == 0b111:
-            return Token.TOK_STRING
-            
-        self.br.rewind(3)
-        raise ValueError(f"Invalid token {tok:03b} at position {self.br.get_pos()}")
+        return TOKENS_BY_BITS[b2 << 1]
 
     def expect(self, msg: str, *bits: int):
         for bit in bits:
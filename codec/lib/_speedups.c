@@ -0,0 +1,235 @@
+/*
+ * Optional compiled versions of the codec inner loops.
+ *
+ * Build in place with: python -m codec.lib.build_speedups
+ * codec/__init__.py picks this module up when it is importable, unless the
+ * BL4_CODEC_PURE environment variable is set. Every function here must give
+ * exactly the same result as the pure-Python code it replaces; the readers
+ * return None instead of raising so the Python path can report the error.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+static const char B85_CHARSET[] =
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{/}~";
+#define B85_PADDING_VALUE 84
+
+static uint8_t MIRROR8[256];
+static uint8_t MIRROR5[32];
+static uint8_t MIRROR4[16];
+
+static uint32_t mirror_bits(uint32_t n, int bit_count)
+{
+    uint32_t re = 0;
+    for (int i = 0; i < bit_count; i++) {
+        if ((n >> i) & 1)
+            re |= 1u << ((bit_count - 1) - i);
+    }
+    return re;
+}
+
+/* n bits (n <= 32) starting at bit pos, MSB first. The caller checks bounds. */
+static inline uint32_t read_bits(const uint8_t *buf, Py_ssize_t pos, int n)
+{
+    uint32_t value = 0;
+    for (int i = 0; i < n; i++, pos++)
+        value = (value << 1) | ((buf[pos >> 3] >> (7 - (pos & 7))) & 1);
+    return value;
+}
+
+/* read_varint(data, pos) -> (value, new_pos), or None if data ends first */
+static PyObject *speedups_read_varint(PyObject *self, PyObject *args)
+{
+    Py_buffer view;
+    Py_ssize_t pos;
+    if (!PyArg_ParseTuple(args, "y*n", &view, &pos))
+        return NULL;
+
+    const uint8_t *buf = view.buf;
+    Py_ssize_t nbits = view.len * 8;
+    uint32_t value = 0;
+    int shift = 0;
+
+    for (int block = 0; block < 4; block++) {
+        if (pos < 0 || pos + 5 > nbits) {
+            PyBuffer_Release(&view);
+            Py_RETURN_NONE;
+        }
+        uint32_t bits = read_bits(buf, pos, 5);
+        pos += 5;
+        value |= (uint32_t)MIRROR4[bits >> 1] << shift;
+        shift += 4;
+        if (!(bits & 1))
+            break;
+    }
+
+    PyBuffer_Release(&view);
+    return Py_BuildValue("(kn)", (unsigned long)value, pos);
+}
+
+/* read_varbit(data, pos) -> (value, new_pos), or None if data ends first */
+static PyObject *speedups_read_varbit(PyObject *self, PyObject *args)
+{
+    Py_buffer view;
+    Py_ssize_t pos;
+    if (!PyArg_ParseTuple(args, "y*n", &view, &pos))
+        return NULL;
+
+    const uint8_t *buf = view.buf;
+    Py_ssize_t nbits = view.len * 8;
+
+    if (pos < 0 || pos + 5 > nbits) {
+        PyBuffer_Release(&view);
+        Py_RETURN_NONE;
+    }
+    int length = MIRROR5[read_bits(buf, pos, 5)];
+    pos += 5;
+
+    if (pos + length > nbits) {
+        PyBuffer_Release(&view);
+        Py_RETURN_NONE;
+    }
+    /* The value is written LSB first */
+    uint32_t value = 0;
+    for (int i = 0; i < length; i++, pos++)
+        value |= (uint32_t)((buf[pos >> 3] >> (7 - (pos & 7))) & 1) << i;
+
+    PyBuffer_Release(&view);
+    return Py_BuildValue("(kn)", (unsigned long)value, pos);
+}
+
+static inline uint32_t b85_group(const uint8_t *d, int count)
+{
+    uint64_t v = 0;
+    for (int i = 0; i < 5; i++)
+        v = v * 85 + (i < count ? d[i] : B85_PADDING_VALUE);
+    return (uint32_t)(v & 0xFFFFFFFFu);
+}
+
+/*
+ * b85_decode(digits) -> bytes
+ * digits are charset indices (all valid). Returns the bit-mirrored data,
+ * the same as decode() once the characters have been translated.
+ */
+static PyObject *speedups_b85_decode(PyObject *self, PyObject *args)
+{
+    Py_buffer view;
+    if (!PyArg_ParseTuple(args, "y*", &view))
+        return NULL;
+
+    const uint8_t *d = view.buf;
+    Py_ssize_t n = view.len;
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (d[i] >= 85) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError, "digit out of range");
+            return NULL;
+        }
+    }
+
+    Py_ssize_t full = n - n % 5;
+    Py_ssize_t char_count = n - full;
+    Py_ssize_t n_bytes = full / 5 * 4 + (char_count > 1 ? char_count - 1 : 0);
+
+    PyObject *out = PyBytes_FromStringAndSize(NULL, n_bytes);
+    if (out == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    uint8_t *o = (uint8_t *)PyBytes_AS_STRING(out);
+
+    for (Py_ssize_t i = 0; i < full; i += 5) {
+        uint32_t v = b85_group(d + i, 5);
+        *o++ = MIRROR8[v >> 24];
+        *o++ = MIRROR8[(v >> 16) & 0xFF];
+        *o++ = MIRROR8[(v >> 8) & 0xFF];
+        *o++ = MIRROR8[v & 0xFF];
+    }
+    if (char_count > 1) {
+        /* Short last group, padded with the padding character */
+        uint32_t v = b85_group(d + full, (int)char_count);
+        for (Py_ssize_t k = 0; k < char_count - 1; k++)
+            *o++ = MIRROR8[(v >> (24 - 8 * k)) & 0xFF];
+    }
+
+    PyBuffer_Release(&view);
+    return out;
+}
+
+static inline void b85_word(uint32_t v, char *out)
+{
+    for (int i = 4; i >= 0; i--) {
+        out[i] = B85_CHARSET[v % 85];
+        v /= 85;
+    }
+}
+
+/* b85_encode(data) -> str, the same as encode() */
+static PyObject *speedups_b85_encode(PyObject *self, PyObject *args)
+{
+    Py_buffer view;
+    if (!PyArg_ParseTuple(args, "y*", &view))
+        return NULL;
+
+    const uint8_t *d = view.buf;
+    Py_ssize_t length = view.len;
+    Py_ssize_t extra_bytes = length % 4;
+    Py_ssize_t full_length = length - extra_bytes;
+    Py_ssize_t n_chars = 2 + full_length / 4 * 5 + (extra_bytes ? extra_bytes + 1 : 0);
+
+    PyObject *out = PyUnicode_New(n_chars, 127);
+    if (out == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    char *o = (char *)PyUnicode_1BYTE_DATA(out);
+    *o++ = '@';
+    *o++ = 'U';
+
+    for (Py_ssize_t i = 0; i < full_length; i += 4) {
+        uint32_t v = ((uint32_t)MIRROR8[d[i]] << 24) | ((uint32_t)MIRROR8[d[i + 1]] << 16)
+                   | ((uint32_t)MIRROR8[d[i + 2]] << 8) | MIRROR8[d[i + 3]];
+        b85_word(v, o);
+        o += 5;
+    }
+    if (extra_bytes) {
+        /* Zero-fill the last group; only extra_bytes + 1 characters are kept */
+        uint32_t v = 0;
+        for (Py_ssize_t k = 0; k < extra_bytes; k++)
+            v |= (uint32_t)MIRROR8[d[full_length + k]] << (24 - 8 * k);
+        char word[5];
+        b85_word(v, word);
+        memcpy(o, word, extra_bytes + 1);
+    }
+
+    PyBuffer_Release(&view);
+    return out;
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"read_varint", speedups_read_varint, METH_VARARGS,
+     "read_varint(data, pos) -> (value, new_pos), or None if data ends first"},
+    {"read_varbit", speedups_read_varbit, METH_VARARGS,
+     "read_varbit(data, pos) -> (value, new_pos), or None if data ends first"},
+    {"b85_decode", speedups_b85_decode, METH_VARARGS,
+     "b85_decode(digits) -> bytes, the mirrored data for valid charset indices"},
+    {"b85_encode", speedups_b85_encode, METH_VARARGS,
+     "b85_encode(data) -> str, the '@U' serial for data"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT, "_speedups", "Compiled codec inner loops.", -1, speedups_methods
+};
+
+PyMODINIT_FUNC PyInit__speedups(void)
+{
+    for (uint32_t i = 0; i < 256; i++)
+        MIRROR8[i] = (uint8_t)mirror_bits(i, 8);
+    for (uint32_t i = 0; i < 32; i++)
+        MIRROR5[i] = (uint8_t)mirror_bits(i, 5);
+    for (uint32_t i = 0; i < 16; i++)
+        MIRROR4[i] = (uint8_t)mirror_bits(i, 4);
+    return PyModule_Create(&speedups_module);
+}
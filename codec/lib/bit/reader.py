@@ -1,51 +1,100 @@
+from codec.lib.bit.repeat import repeat_bits
+
+# Buffers up to this size are converted to a single int once and read with a
+# shift/mask. Shifting a big int costs O(size), so larger buffers read through
+# a small byte window instead.
+_WHOLE_INT_MAX_BYTES = 512
+
+MAX_READ_BITS = 64
+
+
 class BitReader:
     def __init__(self, data: bytes):
         self.data = data
         self.pos = 0
+        self._nbits = len(data) * 8
+        if len(data) <= _WHOLE_INT_MAX_BYTES:
+            self._int = int.from_bytes(data, 'big')
+        else:
+            self._int = None
 
     def read(self) -> (int, bool):
-        if self.pos >= len(self.data) * 8:
+        pos = self.pos
+        if pos >= self._nbits:
             return 0, False
-        
-        byte_index = self.pos // 8
-        bit_index_in_byte = self.pos % 8
-        
-        byte = self.data[byte_index]
-        bit = (byte >> (7 - bit_index_in_byte)) & 1
-        
-        self.pos += 1
-        return bit, True
+
+        self.pos = pos + 1
+        return (self.data[pos >> 3] >> (7 - (pos & 7))) & 1, True
 
     def read2(self) -> (int, int, bool):
-        bit1, ok1 = self.read()
-        if not ok1:
-            return 0, 0, False
-        
-        bit2, ok2 = self.read()
-        if not ok2:
+        value, ok = self.read_n(2)
+        if not ok:
             return 0, 0, False
-            
-        return bit1, bit2, True
+
+        return value >> 1, value & 1, True
 
     def read_n(self, n: int) -> (int, bool):
-        if not (0 < n <= 32):
+        end = self.pos + n
+        if not (0 < n <= MAX_READ_BITS) or end > self._nbits:
             return 0, False
 
-        if self.pos + n > len(self.data) * 8:
-            return 0, False
+        if self._int is not None:
+            value = self._int >> (self._nbits - end)
+        else:
+            # Only touch the bytes that hold the requested bits
+            stop = (end + 7) >> 3
+            window = int.from_bytes(self.data[self.pos >> 3:stop], 'big')
+            value = window >> ((stop << 3) - end)
+
+        self.pos = end
+        return value & ((1 << n) - 1), True
+
+    def _bits(self, start: int, end: int) -> int:
+        # Same as read_n() for bits [start, end), without the size limit or
+        # moving. The caller checks the bounds.
+        if self._int is not None:
+            value = self._int >> (self._nbits - end)
+        else:
+            stop = (end + 7) >> 3
+            window = int.from_bytes(self.data[start >> 3:stop], 'big')
+            value = window >> ((stop << 3) - end)
+        return value & ((1 << (end - start)) - 1)
 
-        value = 0
-        for _ in range(n):
-            bit, _ = self.read()
-            value = (value << 1) | bit
-            
-        return value, True
+    def count_repeats(self, start: int) -> int:
+        """
+        Counts how many copies of the bits in [start, pos) follow pos back to
+        back, without moving. Long runs are found by comparing doubling spans.
+        """
+        pos = self.pos
+        length = pos - start
+        if length <= 0 or pos + length > self._nbits:
+            return 0
+        pattern = self._bits(start, pos)
+        if self._bits(pos, pos + length) != pattern:
+            return 0
+        max_count = (self._nbits - pos) // length
+
+        def matches(first: int, count: int) -> bool:
+            begin = pos + first * length
+            return self._bits(begin, begin + count * length) == repeat_bits(pattern, length, count)
+
+        count = 1
+        step = 1
+        while count + step <= max_count and matches(count, step):
+            count += step
+            step *= 2
+        step //= 2
+        while step:
+            if count + step <= max_count and matches(count, step):
+                count += step
+            step //= 2
+        return count
 
     def get_pos(self) -> int:
         return self.pos
 
     def set_pos(self, n: int) -> bool:
-        if not (0 <= n <= len(self.data) * 8):
+        if not (0 <= n <= self._nbits):
             return False
         self.pos = n
         return True
@@ -56,34 +105,20 @@ class BitReader:
         self.pos -= n
         return True
 
+    def _bit_string(self, start: int, end: int) -> str:
+        if end <= start:
+            return ""
+        value = int.from_bytes(self.data, 'big') >> (self._nbits - end)
+        return format(value & ((1 << (end - start)) - 1), f"0{end - start}b")
+
     def string_before(self) -> str:
-        old_pos = self.pos
-        self.rewind(old_pos)
-        result = []
-        for _ in range(old_pos):
-            bit, _ = self.read()
-            result.append(str(bit))
-        self.pos = old_pos
-        return "".join(result)
+        return self._bit_string(0, self.pos)
 
     def string_after(self) -> str:
-        old_pos = self.pos
-        result = []
-        for _ in range(self.pos, len(self.data) * 8):
-            bit, _ = self.read()
-            result.append(str(bit))
-        self.pos = old_pos
-        return "".join(result)
+        return self._bit_string(self.pos, self._nbits)
 
     def full_string(self) -> str:
-        old_pos = self.pos
-        self.set_pos(0)
-        result = []
-        for _ in range(len(self.data) * 8):
-            bit, _ = self.read()
-            result.append(str(bit))
-        self.pos = old_pos
-        return "".join(result)
+        return self._bit_string(0, self._nbits)
 
     def __len__(self):
-        return len(self.data) * 8
+        return self._nbits
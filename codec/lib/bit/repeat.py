@@ -0,0 +1,6 @@
+def repeat_bits(bits: int, length: int, count: int) -> int:
+    """Returns bits (length bits wide) written count times back to back."""
+    if count <= 0 or length <= 0:
+        return 0
+    # bits * 0b0..01 0..01 0..01, one 1 every length bits
+    return bits * (((1 << (length * count)) - 1) // ((1 << length) - 1))
@@ -1,53 +1,67 @@
+# Pending bits are flushed to the byte buffer once the register holds this many.
+_FLUSH_BITS = 64
+
+
 class Writer:
-    def __init__(self):
-        self.data = bytearray()
+    def __init__(self, capacity: int = 0):
+        # data[:_len] holds the flushed whole bytes; anything past _len is
+        # spare capacity or the padded last byte handed out by get_data().
+        # Bits that don't fill a byte yet stay in the _acc register.
+        self.data = bytearray(capacity)
         self.pos = 0
+        self._len = 0
+        self._acc = 0
+        self._acc_bits = 0
 
     def write_bit(self, bit: int):
-        byte_index = self.pos // 8
-        bit_index_in_byte = 7 - (self.pos % 8)
-
-        while byte_index >= len(self.data):
-            self.data.append(0)
-
-        if bit & 1:
-            self.data[byte_index] |= (1 << bit_index_in_byte)
-        else:
-            self.data[byte_index] &= ~(1 << bit_index_in_byte)
-
-        self.pos += 1
+        self.write_n(bit & 1, 1)
 
     def write_bits(self, *bits: int):
+        value = 0
         for bit in bits:
-            self.write_bit(bit)
+            value = (value << 1) | (bit & 1)
+        self.write_n(value, len(bits))
 
     def write_n(self, value: int, n: int):
-        for i in range(n - 1, -1, -1):
-            bit = (value >> i) & 1
-            self.write_bit(bit)
+        if n <= 0:
+            return
+
+        self._acc = (self._acc << n) | (value & ((1 << n) - 1))
+        self._acc_bits += n
+        self.pos += n
+
+        if self._acc_bits >= _FLUSH_BITS:
+            self._flush()
+
+    def _flush(self):
+        n_bytes = self._acc_bits >> 3
+        if n_bytes:
+            rem = self._acc_bits & 7
+            start = self._len
+            self.data[start:start + n_bytes] = (self._acc >> rem).to_bytes(n_bytes, 'big')
+            self._len = start + n_bytes
+            self._acc &= (1 << rem) - 1
+            self._acc_bits = rem
 
     def get_data(self) -> bytearray:
+        self._flush()
+        del self.data[self._len:]
+        if self._acc_bits:
+            # Zero-padded last byte; it stays outside _len so later writes replace it
+            self.data.append((self._acc << (8 - self._acc_bits)) & 0xFF)
         return self.data
 
     def get_pos(self) -> int:
         return self.pos
 
-    def get_bits(self) -> tuple[int, ...]:
-        bits = []
-        for i in range(self.pos):
-            byte_index = i // 8
-            bit_index_in_byte = 7 - (i % 8)
-            bit = (self.data[byte_index] >> bit_index_in_byte) & 1
-            bits.append(bit)
-        return tuple(bits)
+    def _value(self) -> int:
+        flushed = int.from_bytes(self.data[:self._len], 'big')
+        return (flushed << self._acc_bits) | self._acc
 
     def __str__(self):
-        s = ""
-        for i in range(self.pos):
-            byte_index = i // 8
-            bit_index = 7 - (i % 8)
-            if (self.data[byte_index] >> bit_index) & 1:
-                s += "1"
-            else:
-                s += "0"
-        return s
+        if self.pos == 0:
+            return ""
+        return format(self._value(), f"0{self.pos}b")
+
+    def get_bits(self) -> tuple[int, ...]:
+        return tuple(map(int, str(self)))
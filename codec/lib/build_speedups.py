@@ -0,0 +1,23 @@
+"""
+Builds the optional compiled codec speedups (codec/lib/_speedups.c) in place.
+Needs a C compiler and the Python headers. Run from the repository root:
+
+    python -m codec.lib.build_speedups
+"""
+import os
+from pathlib import Path
+from setuptools import Extension, setup
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+def main():
+    os.chdir(ROOT)
+    setup(
+        name="bl4-codec-speedups",
+        ext_modules=[Extension("codec.lib._speedups", [str(Path("codec", "lib", "_speedups.c"))])],
+        script_args=["build_ext", "--inplace", "--build-temp", str(ROOT / "build")],
+        script_name="build_speedups",
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+log = logging.getLogger(__name__)
+
+# Below this many items a process pool costs more to start (spawning imports
+# the codec in every worker) than it saves
+POOL_MIN_ITEMS = 4000
+
+# Chunks per worker when no chunksize is given, so a slow chunk doesn't hold up the rest
+_CHUNKS_PER_WORKER = 4
+
+def map_chunks(fn, items, workers: int = None, chunksize: int = None, min_items: int = None) -> list:
+    """
+    Calls fn on lists of items and returns the concatenated results, in input
+    order; fn must return one result per item. Large inputs are split into
+    chunks of chunksize items and spread over a ProcessPoolExecutor with
+    workers processes (default: the CPU count), so fn must be a module-level
+    function (or a functools.partial of one) and items and results must
+    pickle. Inputs under min_items (default: POOL_MIN_ITEMS), or workers <= 1,
+    go to fn in a single call in this process.
+    fn is expected to report errors in its results rather than raise.
+    """
+    items = list(items)
+    if min_items is None:
+        min_items = POOL_MIN_ITEMS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(items))
+    if workers <= 1 or len(items) < min_items:
+        return fn(items)
+
+    if chunksize is None:
+        chunksize = -(-len(items) // (workers * _CHUNKS_PER_WORKER))
+    chunksize = max(1, chunksize)
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [result for chunk_results in pool.map(fn, chunks) for result in chunk_results]
+    except (OSError, BrokenProcessPool) as e:
+        # No process support here (sandboxes, some frozen builds) or a worker died
+        log.warning("Process pool failed (%s), running %d items in this process instead", e, len(items))
+        return fn(items)
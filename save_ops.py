@@ -2,7 +2,6 @@
 
 from typing import Any, Dict, List, Optional, Tuple, Union
 import re
-import serial_encoder
 
 
 # Helper to find deeply nested dictionary paths
@@ -222,7 +221,7 @@ def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
             continue
 
         try:
-            formatted_str, _, err = serial_codec.decode_serial_to_string(serial)
+            item, err = serial_codec.decode_item(serial)
             if err:
                 continue
         except Exception as e:
@@ -231,19 +230,13 @@ def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
             print(f"严重解码Error，序列号: {serial}, Error: {e}")
             continue
         
-        split_marker = "||"
-        if split_marker not in formatted_str:
+        # Needs a '<type id>, <flags>, <level>|...||' header
+        if item.header is None:
             continue
         
-        header_part, parts_part = formatted_str.split(split_marker, 1)
-        
         try:
-            id_section = header_part.strip().split('|')[0]
-            id_part = id_section.strip().split(',')
-            if len(id_part) < 4:
-                continue
-            item_id = int(id_part[0].strip())
-            item_level = int(id_part[3].strip())
+            item_id = item.type_id
+            item_level = item.level
 
             manufacturer, item_type, found = item_registry.get_kind_enums(item_id)
             if not found:
@@ -254,7 +247,7 @@ def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
             localized_item_type = get_localized_string(item_type)
             
             item_name = f"{localized_manufacturer} {localized_item_type}"
-            display_parts = parts_part.strip()
+            display_parts = item.parts_text
 
             # Determine container and slot from the path
             container_name = "Unknown"
@@ -286,7 +279,7 @@ def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
                 "id": item_id,
                 "level": item_level,
                 "serial": serial,
-                "decoded_full": formatted_str,
+                "decoded_full": item.text,
                 "decoded_parts": display_parts,
             }
             all_items.append(processed_item)
@@ -805,6 +798,10 @@ def sync_inventory_item_levels(yaml_data: Dict[str, Any]) -> Tuple[int, int, Lis
             return 0, 0, [loc.get("char_level_unknown", "Unknown character level")]
     except (AttributeError, StopIteration):
         return 0, 0, [loc.get("char_data_missing", "Character XP/Level not found in YAML")]
+    try:
+        character_level = int(character_level)
+    except (TypeError, ValueError):
+        return 0, 0, [loc.get("char_level_unknown", "Unknown character level")]
 
     # 2. Find all items in the inventory
     # We use the existing walker to find all items, then filter by container.
@@ -834,27 +831,19 @@ def sync_inventory_item_levels(yaml_data: Dict[str, Any]) -> Tuple[int, int, Lis
             failed_items_info.append(f"{slot_identifier}: {loc.get('missing_serial', 'Missing serial')}")
             continue
 
-        # Decode
-        decoded_full, _, err = serial_codec.decode_serial_to_string(original_serial)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('decode_fail', 'Decode failed')} ({err})")
-            continue
-            
-        # Update level
-        updated_decoded_str = update_level_in_decoded_str(decoded_full, character_level)
-        if not updated_decoded_str:
+        # Only the level bits are rewritten, the rest of the item is checked but stays as it is
+        try:
+            new_serial = serial_codec.patch_level(original_serial, character_level, validate=True)
+        except ValueError as e:
             fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('update_level_fail', 'Level update failed')}")
+            failed_items_info.append(f"{slot_identifier}: {loc.get('update_level_fail', 'Level update failed')} ({e})")
             continue
 
-        # Re-encode
-        new_serial, err = serial_encoder.encode_to_base85(updated_decoded_str)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('reencode_fail', 'Re-encode failed')} ({err})")
+        # Items already at the target level are left untouched
+        if new_serial == original_serial:
+            success_count += 1
             continue
-            
+
         # Write back to YAML object
         try:
             _set_by_path(yaml_data, path + ['serial'], new_serial)
@@ -902,22 +891,17 @@ def set_backpack_item_levels(yaml_data: Dict[str, Any], target_level: int) -> Tu
             failed_items_info.append(f"{slot_identifier}: {loc.get('missing_serial', 'Missing serial')}")
             continue
 
-        decoded_full, _, err = serial_codec.decode_serial_to_string(original_serial)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('decode_fail', 'Decode failed')} ({err})")
-            continue
-
-        updated_decoded_str = update_level_in_decoded_str(decoded_full, level)
-        if not updated_decoded_str:
+        # Only the level bits are rewritten, the rest of the item is checked but stays as it is
+        try:
+            new_serial = serial_codec.patch_level(original_serial, level, validate=True)
+        except ValueError as e:
             fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('update_level_fail', 'Level update failed')}")
+            failed_items_info.append(f"{slot_identifier}: {loc.get('update_level_fail', 'Level update failed')} ({e})")
             continue
 
-        new_serial, err = serial_encoder.encode_to_base85(updated_decoded_str)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('reencode_fail', 'Re-encode failed')} ({err})")
+        # Items already at the target level are left untouched
+        if new_serial == original_serial:
+            success_count += 1
             continue
 
         try:
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from serial_codec import decode_serial_to_string
+from serial_codec import decode_many
 
 codes = [
     # Batch 1 (message 1)
@@ -26,11 +26,15 @@ codes = [
     "@Ugw$Yw2}TYg49^LgLs?Lv61AwZs88)fjYO?PtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwgOvtwhx^(8v%OB12@Lh=z{P5jsK#oiWhJ5E&vvWQYurAu`Y?15FHZks*zK7-&R7LPA1DMn*<PMp9BzQc_Y9<uK5Qh=_=Yh>VPkjEszojEszojEszoq@<*zq@*NDWuQq(Nl8gbNl8gbNl8gbNl8gbNl8gbNl8gbRMCWlgoK2IgoK2I1WJi&iF%2OiMolJi5i2NgX)7Sg_?z`g}Q}$g<6Lihbo6UhZ-(4v;hD",
 ]
 
-for i, code in enumerate(codes):
-    result, blocks, err = decode_serial_to_string(code.strip())
-    out = f"=== Code {i+1} ===\n"
-    if err:
-        out += f"ERROR: {err}\n"
-    else:
-        out += result + "\n"
-    sys.stdout.buffer.write((out + "\n").encode("utf-8"))
+def main():
+    for i, (result, blocks, err) in enumerate(decode_many([code.strip() for code in codes])):
+        out = f"=== Code {i+1} ===\n"
+        if err:
+            out += f"ERROR: {err}\n"
+        else:
+            out += result + "\n"
+        sys.stdout.buffer.write((out + "\n").encode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
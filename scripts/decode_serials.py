@@ -20,30 +20,25 @@ except ImportError as e:
     sys.exit(1)
 
 
-def decode_one(serial_b85: str) -> dict:
+def decode_one(serial_b85: str, decoded=None) -> dict:
+    """decoded: the serial_codec.decode_many() result for the serial, if already decoded."""
     out = {"serial": serial_b85}
     if not serial_b85 or not isinstance(serial_b85, str) or not serial_b85.strip().startswith("@U"):
         out["error"] = "Invalid serial (must start with @U)"
         return out
-    formatted_str, _, err = serial_codec.decode_serial_to_string(serial_b85.strip())
+    if decoded is None:
+        item, err = serial_codec.decode_item(serial_b85.strip())
+    else:
+        text, blocks, err = decoded
+        item = None if err else serial_codec.DecodedItem(blocks, text)
     if err:
         out["error"] = str(err)
         return out
-    if "||" not in formatted_str:
-        out["error"] = "Decoded string has no ||"
-        return out
-    header_part, _ = formatted_str.split("||", 1)
-    try:
-        id_section = header_part.strip().split("|")[0]
-        id_part = [p.strip() for p in id_section.split(",")]
-        if len(id_part) < 4:
-            out["error"] = "Header has fewer than 4 parts"
-            return out
-        item_id = int(id_part[0])
-        item_level = int(id_part[3])
-    except (ValueError, IndexError) as e:
-        out["error"] = str(e)
+    if item.header is None:
+        out["error"] = "Decoded item has no '<type id>, <flags>, <level>||' header"
         return out
+    item_id = item.type_id
+    item_level = item.level
     manufacturer, item_type, found = item_registry.get_kind_enums(item_id)
     if not found:
         manufacturer, item_type = "Unknown", "Unknown"
@@ -52,7 +47,7 @@ def decode_one(serial_b85: str) -> dict:
     out["manufacturer"] = manufacturer
     out["itemType"] = item_type
     out["name"] = f"{manufacturer} {item_type}"
-    out["decodedFull"] = formatted_str
+    out["decodedFull"] = item.text
     return out
 
 
@@ -65,7 +60,8 @@ def main():
     serials = payload.get("serials")
     if not isinstance(serials, list):
         serials = []
-    items = [decode_one(s) for s in serials]
+    decoded = serial_codec.decode_many([s.strip() if isinstance(s, str) else s for s in serials])
+    items = [decode_one(s, d) for s, d in zip(serials, decoded)]
     print(json.dumps({"items": items}, separators=(",", ":")))
 
 
@@ -131,11 +131,18 @@ def walk_for_serials(node, path=None):
             found.extend(walk_for_serials(v, path + [str(i)]))
     return found
 
-def decode_item(serial: str) -> dict:
-    """Decode a single Base85 serial into structured item data."""
+def decode_item(serial: str, decoded=None) -> dict:
+    """
+    Decode a single Base85 serial into structured item data.
+    decoded: the serial_codec.decode_many() result for the serial, if already decoded.
+    """
     result = {"serial": serial}
     try:
-        formatted_str, _, err = serial_codec.decode_serial_to_string(serial.strip())
+        if decoded is None:
+            item, err = serial_codec.decode_item(serial.strip())
+        else:
+            text, blocks, err = decoded
+            item = None if err else serial_codec.DecodedItem(blocks, text)
         if err:
             result["error"] = str(err)
             return result
@@ -143,27 +150,20 @@ def decode_item(serial: str) -> dict:
         result["error"] = str(e)
         return result
 
-    result["decoded"] = formatted_str
-    if "||" not in formatted_str:
+    result["decoded"] = item.text
+    if item.header is None:
         return result
 
-    header_part, parts_part = formatted_str.split("||", 1)
-    result["parts"] = parts_part.strip()
-    try:
-        id_section = header_part.strip().split('|')[0]
-        id_parts = [p.strip() for p in id_section.split(',')]
-        if len(id_parts) >= 4:
-            result["typeId"] = int(id_parts[0])
-            result["level"] = int(id_parts[3])
-            mfg, item_type, found = item_registry.get_kind_enums(result["typeId"])
-            if found:
-                result["manufacturer"] = mfg
-                result["itemType"] = item_type
-            else:
-                result["manufacturer"] = "Unknown"
-                result["itemType"] = "Unknown"
-    except (ValueError, IndexError):
-        pass
+    result["parts"] = item.parts_text
+    result["typeId"] = item.type_id
+    result["level"] = item.level
+    mfg, item_type, found = item_registry.get_kind_enums(result["typeId"])
+    if found:
+        result["manufacturer"] = mfg
+        result["itemType"] = item_type
+    else:
+        result["manufacturer"] = "Unknown"
+        result["itemType"] = "Unknown"
     return result
 
 def get_container_name(path):
@@ -235,12 +235,13 @@ def main():
 
     print(f"[INFO] Found {len(discovered)} items", file=sys.stderr)
 
-    # Decode all items
+    # Decode all items (spread over the CPU cores for big saves)
+    serials = [node['serial'] for _, node in discovered]
+    decoded = serial_codec.decode_many([s.strip() for s in serials])
     items = []
     errors = 0
-    for path, node in discovered:
-        serial = node['serial']
-        item = decode_item(serial)
+    for (path, node), serial, result in zip(discovered, serials, decoded):
+        item = decode_item(serial, result)
         item['container'] = get_container_name(path)
         if 'error' in item:
             errors += 1
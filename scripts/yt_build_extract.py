@@ -1,7 +1,11 @@
 """Extract a BL4 build from a YouTube video transcript and output as AssembledBuild JSON."""
 import sys, re, json
+from pathlib import Path
 
 sys.stdout.reconfigure(encoding='utf-8')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codec.b4s.serial.item import DecodedItem
 
 video_id = sys.argv[1] if len(sys.argv) > 1 else ""
 level = int(sys.argv[2]) if len(sys.argv) > 2 else 60
@@ -151,15 +155,27 @@ for i, w in enumerate(found_weapons):
 
     # Check godroll
     gr = find_godroll(name, dominant_el)
+    item = None
     if gr:
-        decoded = gr['decoded']
-        decoded = re.sub(r'^(\d+),\s*0,\s*1,\s*\d+', rf'\1, 0, 1, {level}', decoded)
-        decoded = re.sub(r'\|\s*2,\s*\d+\s*\|', f'| 2, {next_seed()}|', decoded)
+        try:
+            item = DecodedItem.from_string(gr.get('decoded'))
+            # The level only goes behind the usual '0, 1' flags and the seed
+            # only into a plain '| 2, <seed>|' group
+            if item.flags == (0, 1):
+                item.level = level
+            seed = next_seed()
+            if any(group[0] == 2 and len(group) == 2 for group in (item.groups or ())[1:]):
+                item.seed = seed
+        except (ValueError, TypeError) as e:
+            # Malformed godroll entry, assemble the weapon from the DB instead
+            print(f"Skipping godroll {gr.get('name', '?')}: {e}", file=sys.stderr)
+            item = None
+    if item is not None:
         items.append({
             "slot": slot, "category": "Weapon",
             "itemName": f"{name} (Godroll)", "manufacturer": mfg,
-            "weaponType": wt, "decoded": decoded,
-            "typeId": decoded.split(',')[0].strip(),
+            "weaponType": wt, "decoded": item.text,
+            "typeId": str(item.type_id),
             "confidence": "exact",
             "notes": f"From godroll: {gr['name']}",
         })
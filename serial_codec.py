@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import NamedTuple
 
 # Add the parent directory of 'codec' to the system path
 # This allows importing modules from it, assuming a standard structure
@@ -8,71 +11,108 @@ current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir))
 
 try:
-    from codec.b4s.b85.decode import decode
+    from codec.b4s.b85.decode import decode_view
     from codec.b4s.b85.encode import encode
     from codec.b4s.serial.deserialize import deserialize
-    from codec.b4s.serial.serialize import serialize
     from codec.b4s.serial.from_string import from_string
+    from codec.b4s.serial.encode_text import serialize_text
     from codec.b4s.serial.block import Block
+    from codec.b4s.serial.formatter import format_blocks
+    from codec.b4s.serial.item import DecodedItem
+    from codec.b4s.serial.level_patch import patch_level as _patch_level
     from codec.b4s.serial_tokenizer.tokenizer import Token
-    from codec.b4s.serial_datatypes.part.part import PartSubType
+    from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+    from codec.b4s.b85 import batch as b85_batch
+    from codec.lib.pool import map_chunks
 except ImportError as e:
     raise ImportError(
         f"无法从 'codec' 导入模块。请确保该目录与此脚本位于同一级别。\nError: {e}"
     )
 
-def _format_blocks(blocks: list[Block]) -> str:
-    """
-    Formats deserialized blocks into a human-readable string, similar to the
-    original main.py in the decoder library.
-    Example output: '8, 0, 1, 50| 2, 1570|| {53} {2} ...'
-    """
-    output_parts = []
-    for i, block in enumerate(blocks):
-        token = block.token
-        
-        current_part = ""
-        is_data_block = False
-
-        if token in [Token.TOK_VARINT, Token.TOK_VARBIT]:
-            current_part = str(block.value)
-            is_data_block = True
-        elif token == Token.TOK_PART:
-            part = block.part
-            if part.sub_type == PartSubType.SUBTYPE_NONE:
-                current_part = f"{{{part.index}}}"
-            elif part.sub_type == PartSubType.SUBTYPE_INT:
-                current_part = f"{{{part.index}:{part.value}}}"
-            elif part.sub_type == PartSubType.SUBTYPE_LIST:
-                values_str = ' '.join(map(str, part.values))
-                current_part = "{" + f"{part.index}:[{values_str}]" + "}"
-            is_data_block = True
-        elif token == Token.TOK_STRING:
-            escaped_str = block.value_str.replace('\\', '\\\\').replace('"', '\\"')
-            current_part = f'"{escaped_str}"'
-            is_data_block = True
-        elif token == Token.TOK_SEP1:
-            current_part = "|"
-        elif token == Token.TOK_SEP2:
-            current_part = ","
-        
-        output_parts.append(current_part)
-
-        # Add spacing for readability, matching the desired format
-        if i + 1 < len(blocks):
-            next_block = blocks[i+1]
-            if is_data_block and next_block.token not in [Token.TOK_SEP1, Token.TOK_SEP2]:
-                 output_parts.append(" ")
-            elif token == Token.TOK_SEP2:
-                output_parts.append(" ")
-            elif token == Token.TOK_SEP1 and next_block.token != Token.TOK_SEP1:
-                 output_parts.append(" ")
-
-    return "".join(output_parts)
+# Decode cache bounds. Entries are capped by count and by the summed serial
+# length, since a modded serial carries hundreds of blocks.
+DECODE_CACHE_SIZE = 2048
+DECODE_CACHE_CHARS = 2_000_000
+
+class DecodeCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    chars: int
+
+INVALID_SERIAL_ERROR = "无效的序列号: 它必须以'@U'开头。"
+
+# Cache entries are (formatted_string, frozen_blocks, error), with the blocks
+# as nested tuples so nothing a caller gets back is shared with the cache
+_decode_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+_decode_cache_chars = 0
+_decode_cache_hits = 0
+_decode_cache_misses = 0
+
+def _freeze_blocks(blocks) -> tuple:
+    return tuple(
+        (b.token, b.value, b.value_str,
+         None if b.part is None else (b.part.index, b.part.sub_type, b.part.value, tuple(b.part.values)))
+        for b in blocks
+    )
+
+def _thaw_blocks(frozen: tuple) -> list:
+    return [
+        Block(token, value, value_str, None if part is None else Part(part[0], part[1], part[2], list(part[3])))
+        for token, value, value_str, part in frozen
+    ]
+
+def _cache_get(serial_b85: str):
+    """The cached result for the serial with fresh blocks, or None. Counts the hit or miss."""
+    global _decode_cache_hits, _decode_cache_misses
+    with _decode_cache_lock:
+        entry = _decode_cache.get(serial_b85)
+        if entry is None:
+            _decode_cache_misses += 1
+            return None
+        _decode_cache.move_to_end(serial_b85)
+        _decode_cache_hits += 1
+    formatted_string, frozen, err = entry
+    return formatted_string, _thaw_blocks(frozen), err
+
+def _cache_put(serial_b85: str, result: tuple):
+    global _decode_cache_chars
+    if len(serial_b85) > DECODE_CACHE_CHARS:
+        return
+    formatted_string, blocks, err = result
+    entry = (formatted_string, _freeze_blocks(blocks), err)
+    with _decode_cache_lock:
+        if serial_b85 not in _decode_cache:
+            _decode_cache[serial_b85] = entry
+            _decode_cache_chars += len(serial_b85)
+            while len(_decode_cache) > DECODE_CACHE_SIZE or _decode_cache_chars > DECODE_CACHE_CHARS:
+                evicted, _ = _decode_cache.popitem(last=False)
+                _decode_cache_chars -= len(evicted)
+
+def _decode_data(decoded_data) -> (str, list, str or None):
+    try:
+        blocks, _, err = deserialize(decoded_data)
+        if err:
+            return "", [], str(err)
+
+        formatted_string = format_blocks(blocks)
+        return formatted_string, blocks, None
+
+    except (ValueError, IOError, EOFError) as e:
+        return "", [], f"解码过程中发生Error: {e}"
+
+def _decode_uncached(serial_b85: str) -> (str, list, str or None):
+    try:
+        decoded_data = decode_view(serial_b85)
+    except ValueError as e:
+        return "", [], f"解码过程中发生Error: {e}"
+    return _decode_data(decoded_data)
 
 def decode_serial_to_string(serial_b85: str) -> (str, list, str or None):
     """
     Decodes a Base85 serial string into a human-readable formatted string.
+    Results are kept in a bounded LRU cache keyed by the serial; see clear_cache().
     
     Args:
         serial_b85: The Base85 encoded item serial, starting with '@U'.
@@ -80,23 +120,96 @@ def decode_serial_to_string(serial_b85: str) -> (str, list, str or None):
     Returns:
         A tuple containing:
         - The formatted string representation of the item data.
-        - The raw blocks list from deserialization.
+        - The raw blocks list from deserialization, new objects on every call.
         - An error message string if an error occurs, otherwise None.
     """
     if not serial_b85 or not serial_b85.startswith("@U"):
-        return "", [], "无效的序列号: 它必须以'@U'开头。"
+        return "", [], INVALID_SERIAL_ERROR
+
+    result = _cache_get(serial_b85)
+    if result is None:
+        result = _decode_uncached(serial_b85)
+        _cache_put(serial_b85, result)
+    return result
+
+def _decodes_cleanly_cached(serial_b85: str) -> bool:
+    """True if the decode cache already holds an error-free result for the serial. Not counted as a hit or miss."""
+    with _decode_cache_lock:
+        entry = _decode_cache.get(serial_b85)
+    return entry is not None and entry[2] is None
+
+def patch_level(serial_b85: str, new_level: int, validate: bool = False) -> str:
+    """
+    Sets the level in a serial without re-encoding the item, see
+    codec.b4s.serial.level_patch.patch_level. With validate set, a serial the
+    decode cache already holds as decoding cleanly isn't walked again.
+    Raises ValueError if the serial is invalid.
+    """
+    if validate and _decodes_cleanly_cached(serial_b85):
+        validate = False
+    return _patch_level(serial_b85, new_level, validate)
+
+def decode_item(serial_b85: str) -> (DecodedItem or None, str or None):
+    """
+    Decodes a Base85 serial into a DecodedItem (header fields, parts, lazily
+    rendered text), going through the decode cache.
+
+    Returns:
+        A tuple of the DecodedItem, or None on error, and the error message or None.
+    """
+    formatted_string, blocks, err = decode_serial_to_string(serial_b85)
+    if err:
+        return None, err
+    return DecodedItem(blocks, formatted_string), None
+
+def _decode_chunk(serials: list) -> list:
+    """decode_serial_to_string() for each serial, with the cache misses Base85-decoded in one batch."""
+    results = [None] * len(serials)
+    pending = []
+    for i, serial in enumerate(serials):
+        if not isinstance(serial, str) or not serial.startswith("@U"):
+            results[i] = ("", [], INVALID_SERIAL_ERROR)
+            continue
+        results[i] = _cache_get(serial)
+        if results[i] is None:
+            pending.append(i)
+    if not pending:
+        return results
 
     try:
-        decoded_data = decode(serial_b85)
-        blocks, _, err = deserialize(decoded_data)
-        if err:
-            return "", [], str(err)
-        
-        formatted_string = _format_blocks(blocks)
-        return formatted_string, blocks, None
+        decoded = b85_batch.decode_many([serials[i] for i in pending])
+    except ValueError:
+        # A serial the Base85 stage rejects, decode one by one for the per-item errors
+        decoded = None
+    for n, i in enumerate(pending):
+        result = _decode_uncached(serials[i]) if decoded is None else _decode_data(decoded[n])
+        _cache_put(serials[i], result)
+        results[i] = result
+    return results
 
-    except (ValueError, IOError, EOFError) as e:
-        return "", [], f"解码过程中发生Error: {e}"
+def decode_many(serials, workers: int = None, chunksize: int = None) -> list:
+    """
+    Decodes many serials. Large inputs are split over a process pool (see
+    codec.lib.pool.map_chunks for workers and chunksize), each chunk goes
+    through the batch Base85 decoder (codec.b4s.b85.batch).
+
+    Returns:
+        A list with the decode_serial_to_string() result for each serial, in
+        input order. Errors are reported per item, nothing is raised.
+    """
+    return map_chunks(_decode_chunk, serials, workers, chunksize)
+
+def cache_info() -> DecodeCacheInfo:
+    """Hit/miss counters and current size of the decode cache."""
+    with _decode_cache_lock:
+        return DecodeCacheInfo(_decode_cache_hits, _decode_cache_misses, len(_decode_cache), _decode_cache_chars)
+
+def clear_cache():
+    """Empties the decode cache and resets its counters."""
+    global _decode_cache_chars, _decode_cache_hits, _decode_cache_misses
+    with _decode_cache_lock:
+        _decode_cache.clear()
+        _decode_cache_chars = _decode_cache_hits = _decode_cache_misses = 0
 
 def clean_decoded_string(decoded_string: str) -> (str, str or None):
     """
@@ -105,7 +218,6 @@ def clean_decoded_string(decoded_string: str) -> (str, str or None):
     - Consecutive same-index list parts {k:[x]} {k:[y]} {k:[z]} become {k:[x y z]}.
     Returns (cleaned_string, None) or ("", error_message).
     """
-    from codec.b4s.serial_datatypes.part.part import Part
     if not decoded_string or not decoded_string.strip():
         return "", "Input is empty."
     try:
@@ -165,9 +277,17 @@ def clean_decoded_string(decoded_string: str) -> (str, str or None):
         out.append(block)
         i += 1
 
-    return _format_blocks(out), None
+    return format_blocks(out), None
 
 
+def _serialize_string(decoded_string: str) -> (bytearray or None, str or None):
+    if not decoded_string:
+        return None, "输入字符串不能为空。"
+    try:
+        return serialize_text(decoded_string), None
+    except Exception as e:
+        return None, f"编码过程中发生Error: {e}"
+
 def encode_string_to_serial(decoded_string: str) -> (str, str or None):
     """
     Encodes a human-readable string back into a Base85 serial.
@@ -180,13 +300,24 @@ def encode_string_to_serial(decoded_string: str) -> (str, str or None):
         - The Base85 encoded serial string.
         - An error message string if an error occurs, otherwise None.
     """
-    if not decoded_string:
-        return "", "输入字符串不能为空。"
-    
-    try:
-        blocks = from_string(decoded_string)
-        serialized_data = serialize(blocks)
-        encoded_serial = encode(serialized_data)
-        return encoded_serial, None
-    except Exception as e:
-        return "", f"编码过程中发生Error: {e}"
+    data, err = _serialize_string(decoded_string)
+    if err:
+        return "", err
+    return encode(data), None
+
+def _encode_chunk(decoded_strings: list) -> list:
+    """encode_string_to_serial() for each string, with the Base85 stage done in one batch."""
+    serialized = [_serialize_string(s) for s in decoded_strings]
+    serials = iter(b85_batch.encode_many([data for data, err in serialized if not err]))
+    return [("", err) if err else (next(serials), None) for _, err in serialized]
+
+def encode_many(decoded_strings, workers: int = None, chunksize: int = None) -> list:
+    """
+    Encodes many item strings, in a process pool for large inputs (see
+    codec.lib.pool.map_chunks for workers and chunksize).
+
+    Returns:
+        A list with the encode_string_to_serial() result for each string, in
+        input order. Errors are reported per item, nothing is raised.
+    """
+    return map_chunks(_encode_chunk, decoded_strings, workers, chunksize)
@@ -1,28 +1,51 @@
 from codec.b4s.serial.from_string import from_string
 from codec.b4s.serial.serialize import serialize
+from codec.b4s.b85 import batch as b85_batch
 from codec.b4s.b85.encode import encode
+from codec.b4s.serial.encode_text import serialize_text
+from codec.lib.pool import map_chunks
+from functools import partial
 
-def encode_to_base85(decoded_str: str, new_level: int = -1) -> (str, str):
-    """
-    Encodes a human-readable string of decoded parts back into a Base85 serial.
-    Returns a tuple of (encoded_serial, error_message).
-    """
+def _serialize(decoded_str: str, new_level: int) -> (bytearray, str):
+    """The serialized data encode_to_base85() encodes, or (None, error_message)."""
     if not decoded_str:
-        return "", "Decoded string cannot be empty."
+        return None, "Decoded string cannot be empty."
 
     try:
+        if new_level == -1:
+            return serialize_text(decoded_str), ""
+
         blocks = from_string(decoded_str)
         
-        # If a new level is provided, update the relevant block
-        if new_level != -1:
-            # The level is the 4th block in the sequence (index 3)
-            if len(blocks) > 3:
-                blocks[3].value = new_level
-            else:
-                return "", "Invalid block structure for level update."
+        # The level is the 4th block in the sequence (index 3)
+        if len(blocks) > 3:
+            blocks[3].value = new_level
+        else:
+            return None, "Invalid block structure for level update."
 
-        serialized_data = serialize(blocks)
-        encoded_serial = encode(serialized_data)
-        return encoded_serial, ""
+        return serialize(blocks), ""
     except Exception as e:
-        return "", f"Failed to encode: {e}"
+        return None, f"Failed to encode: {e}"
+
+def encode_to_base85(decoded_str: str, new_level: int = -1) -> (str, str):
+    """
+    Encodes a human-readable string of decoded parts back into a Base85 serial.
+    Returns a tuple of (encoded_serial, error_message).
+    """
+    serialized_data, err = _serialize(decoded_str, new_level)
+    if serialized_data is None:
+        return "", err
+    return encode(serialized_data), ""
+
+def _encode_chunk(decoded_strs: list, new_level: int) -> list:
+    serialized = [_serialize(s, new_level) for s in decoded_strs]
+    serials = iter(b85_batch.encode_many([data for data, _ in serialized if data is not None]))
+    return [("", err) if data is None else (next(serials), "") for data, err in serialized]
+
+def encode_many(decoded_strs, new_level: int = -1, workers: int = None, chunksize: int = None) -> list:
+    """
+    Encodes many decoded strings, in a process pool for large inputs, with the
+    Base85 stage of each chunk done in one batch.
+    Returns the encode_to_base85() result for each string, in input order.
+    """
+    return map_chunks(partial(_encode_chunk, new_level=new_level), decoded_strs, workers, chunksize)
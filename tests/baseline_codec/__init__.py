@@ -0,0 +1,13 @@
+"""
+Snapshot of the codec/ package as it was before the performance work, used
+as the oracle in test_differential.py. The files are copied unchanged except
+for their imports, which point here instead of at codec/. Don't edit them;
+the point is that they behave exactly like the original code.
+
+Regenerate with:
+
+  for f in $(git ls-tree -r --name-only 52bdc1a codec/); do
+    out=tests/baseline_codec/${f#codec/}; mkdir -p "$(dirname "$out")"
+    git show 52bdc1a:"$f" | sed -E 's/^(\\s*)from codec\\./\\1from baseline_codec./' > "$out"
+  done
+"""
@@ -0,0 +1,11 @@
+import pytest
+
+import serial_codec
+
+
+@pytest.fixture
+def empty_cache():
+    """Runs the test with an empty decode cache and leaves none behind."""
+    serial_codec.clear_cache()
+    yield
+    serial_codec.clear_cache()
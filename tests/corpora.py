@@ -0,0 +1,44 @@
+"""
+Item corpora shared by the tests and benchmarks/run_codec.py.
+
+  godroll_texts()    decoded strings from godrolls.json
+  reference_texts()  the single parts in scripts/reference_codes.json, each
+                     wrapped in a minimal item
+  modded_texts()     decoded strings from docs/all_modded_codes_raw.txt
+  modded_serials()   the long modded serials listed in scripts/decode_codes.py
+"""
+import json
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Header and trailer around a lone part so it reads as a complete item
+_ITEM_PREFIX = "1, 0, 1, 50| 2, 3|| "
+_ITEM_SUFFIX = "|"
+
+
+def wrap_part(part: str) -> str:
+    """Turn a part string such as '{4:[1 2]}' into a minimal item string."""
+    return _ITEM_PREFIX + part + _ITEM_SUFFIX
+
+
+def godroll_texts() -> list[str]:
+    with open(ROOT / "godrolls.json", encoding="utf-8") as f:
+        return [roll["decoded"] for roll in json.load(f)]
+
+
+def reference_texts(limit: Optional[int] = None) -> list[str]:
+    with open(ROOT / "scripts" / "reference_codes.json", encoding="utf-8") as f:
+        return [wrap_part(code) for code in json.load(f)[:limit]]
+
+
+def modded_texts() -> list[str]:
+    with open(ROOT / "docs" / "all_modded_codes_raw.txt", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def modded_serials() -> list[str]:
+    # Some of these were copied from chat and are damaged; callers filter them
+    from scripts.decode_codes import codes
+    return [code.strip() for code in codes]
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from codec.b4s.b85 import batch
+from codec.b4s.b85.decode import decode
+from codec.b4s.b85.encode import encode
+
+_rnd = random.Random(85)
+# Every length mod 4, including empty and single-byte buffers
+BUFFERS = [bytes(_rnd.randrange(256) for _ in range(n)) for n in list(range(9)) + [_rnd.randrange(9, 300) for _ in range(60)]]
+SERIALS = [encode(b) for b in BUFFERS]
+# Characters outside the charset are skipped but still count towards their group
+NOISY = [s[:2 + i] + c + s[2 + i:] for s, i, c in zip(SERIALS[9:30], range(1, 30), " \n\"',.[]\\|" * 3)]
+
+
+@pytest.fixture(params=["numpy", "per_item", "no_numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if not batch.HAVE_NUMPY:
+            pytest.skip("NumPy not installed")
+        # The NumPy pass is only used without the compiled codec
+        monkeypatch.setattr(batch, "speedups", None)
+    elif request.param == "no_numpy":
+        monkeypatch.setattr(batch, "np", None)
+    return request.param
+
+
+def test_decode_many_matches_decode(backend):
+    serials = SERIALS + NOISY + SERIALS[::-1]
+    assert batch.decode_many(serials) == [decode(s) for s in serials]
+
+
+def test_encode_many_matches_encode(backend):
+    buffers = BUFFERS + [bytearray(b) for b in BUFFERS[:20]] + [memoryview(b) for b in BUFFERS[:20]]
+    assert batch.encode_many(buffers) == [encode(b) for b in buffers]
+
+
+def test_below_min_batch_size(backend, monkeypatch):
+    def no_numpy(*args):
+        raise AssertionError("NumPy pass used")
+    monkeypatch.setattr(batch, "_decode_batch_numpy", no_numpy)
+    monkeypatch.setattr(batch, "_encode_batch_numpy", no_numpy)
+    small = SERIALS[:batch.MIN_BATCH_SIZE - 1]
+    assert batch.decode_many(small) == [decode(s) for s in small]
+    assert batch.encode_many(BUFFERS[:3]) == SERIALS[:3]
+    assert batch.decode_many([]) == []
+    assert batch.encode_many([]) == []
+
+
+@pytest.mark.parametrize("bad", ["nope", "@U€"])
+def test_invalid_serial_raises(backend, bad):
+    with pytest.raises(ValueError):
+        decode(bad)
+    with pytest.raises(ValueError):
+        batch.decode_many(SERIALS[:20] + [bad])
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+import codec
+from corpora import ROOT
+
+
+def test_roundtrip_suite_on_pure_python():
+    """Runs the round-trip suite again with the compiled speedups disabled."""
+    env = dict(os.environ, **{codec.PURE_ENV_VAR: "1"})
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests/test_roundtrip.py"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    check = subprocess.run(
+        [sys.executable, "-c", "import codec; print(codec.ACCELERATED)"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    assert check.stdout.strip() == "False"
@@ -0,0 +1,96 @@
+import pytest
+
+from codec.b4s.b85.decode import decode
+from codec.b4s.serial.block import Block
+from codec.b4s.serial.block_stream import BlockStream
+from codec.b4s.serial.deserialize import deserialize, deserialize_stream
+from codec.b4s.serial.encode_text import serialize_text
+from codec.b4s.serial.formatter import format_blocks
+from codec.b4s.serial.serialize import serialize
+from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+from codec.b4s.serial_tokenizer.tokenizer import Token
+from corpora import godroll_texts, modded_serials, modded_texts, reference_texts
+
+# One block of every kind, with values at the edges of what the format carries
+BLOCKS = [
+    Block(Token.TOK_VARINT, 0),
+    Block(Token.TOK_VARINT, 0xFFFF),
+    Block(Token.TOK_SEP2),
+    Block(Token.TOK_VARBIT, 0x7FFFFFFF),
+    Block(Token.TOK_PART, part=Part(3, PartSubType.SUBTYPE_NONE)),
+    Block(Token.TOK_PART, part=Part(7, PartSubType.SUBTYPE_INT, value=12)),
+    Block(Token.TOK_PART, part=Part(9, PartSubType.SUBTYPE_LIST, values=[1, 2, 0xFFFF])),
+    Block(Token.TOK_PART, part=Part(10, PartSubType.SUBTYPE_LIST, values=[])),
+    Block(Token.TOK_STRING, value_str="hello"),
+    Block(Token.TOK_STRING, value_str=""),
+    Block(Token.TOK_STRING, value_str="hello"),
+    Block(Token.TOK_SEP1),
+]
+
+
+def _corpus_data() -> list[bytes]:
+    data = [bytes(serialize_text(t)) for t in godroll_texts() + reference_texts() + modded_texts()]
+    for serial in modded_serials():
+        try:
+            data.append(decode(serial))
+        except ValueError:
+            pass
+    return data
+
+
+def _outcome(fn, data: bytes, debug: bool = False) -> tuple:
+    # Damaged part payloads raise out of deserialize, both versions must agree on that too
+    try:
+        blocks, debug_str, err = fn(data, debug)
+    except (IOError, ValueError) as e:
+        return "raised", type(e)
+    return list(blocks), debug_str, type(err)
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_matches_deserialize_on_corpora(debug):
+    for data in _corpus_data():
+        expected = _outcome(deserialize, data, debug)
+        assert _outcome(deserialize_stream, data, debug) == expected
+        if expected[0] == "raised":
+            continue
+        blocks = expected[0]
+        stream = deserialize_stream(data)[0]
+        assert len(stream) == len(blocks)
+        assert serialize(stream) == serialize(blocks)
+        assert format_blocks(stream) == format_blocks(blocks)
+
+
+def test_from_blocks_round_trip():
+    stream = BlockStream.from_blocks(BLOCKS)
+    assert len(stream) == len(BLOCKS)
+    assert list(stream) == BLOCKS
+    assert [stream[i] for i in range(-len(BLOCKS), 0)] == BLOCKS
+    assert serialize(stream) == serialize(BLOCKS)
+    assert deserialize_stream(serialize(BLOCKS))[0].to_blocks() == BLOCKS
+
+
+def test_blocks_are_independent():
+    stream = BlockStream.from_blocks(BLOCKS)
+    stream[6].part.values.append(5)
+    assert stream[6].part.values == [1, 2, 0xFFFF]
+
+
+def test_index_out_of_range():
+    stream = BlockStream.from_blocks(BLOCKS[:2])
+    with pytest.raises(IndexError):
+        stream[2]
+    with pytest.raises(IndexError):
+        stream[-3]
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00", b"\x2f\xff", bytes(serialize(BLOCKS))[:6]])
+def test_errors_match_deserialize(data):
+    assert _outcome(deserialize_stream, data) == _outcome(deserialize, data)
+
+
+def test_error_returns_an_empty_stream():
+    stream, _, err = deserialize_stream(b"")
+    assert isinstance(err, EOFError)
+    assert len(stream) == 0
+    assert stream.to_blocks() == []
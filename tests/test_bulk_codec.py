@@ -0,0 +1,114 @@
+import logging
+import pickle
+
+import pytest
+
+import serial_codec
+import serial_encoder
+from codec.b4s.b85 import batch as b85_batch
+from codec.lib import pool
+
+STRINGS = [
+    "1, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|",
+    "7, 0, 1, 50| 2, 3308|| {1} {2} \"hello\"|",
+    "255, 0, 1, 60| 2, 70000|| {300:[1 2 3]}|",
+]
+SERIALS = [serial_codec.encode_string_to_serial(s)[0] for s in STRINGS]
+# Mixed input: valid serials, a bad prefix, data that doesn't deserialize, a
+# non-string, a serial the Base85 stage rejects and a serial with a character
+# outside the charset
+MIXED = SERIALS + ["nope", "@U!!!!!", None, "@U€", SERIALS[0] + " "] + SERIALS[::-1]
+BAD_STRINGS = ["", "not an item ||| {", None]
+
+
+pytestmark = pytest.mark.usefixtures("empty_cache")
+
+
+@pytest.fixture
+def force_pool(monkeypatch):
+    # Send even tiny inputs through the pool
+    monkeypatch.setattr(pool, "POOL_MIN_ITEMS", 0)
+
+
+@pytest.fixture(params=["compiled", "numpy"])
+def b85_backend(request, monkeypatch):
+    if request.param == "numpy":
+        if not b85_batch.HAVE_NUMPY:
+            pytest.skip("NumPy not installed")
+        monkeypatch.setattr(b85_batch, "speedups", None)
+        monkeypatch.setattr(b85_batch, "MIN_BATCH_SIZE", 1)
+    return request.param
+
+
+def _expected_decode(serials):
+    results = []
+    for serial in serials:
+        if not isinstance(serial, str):
+            results.append(("", [], serial_codec.INVALID_SERIAL_ERROR))
+        else:
+            results.append(serial_codec.decode_serial_to_string(serial))
+    serial_codec.clear_cache()
+    return results
+
+
+def test_decode_many_keeps_order_and_reports_errors(b85_backend):
+    results = serial_codec.decode_many(MIXED * 3)
+    assert results == _expected_decode(MIXED * 3)
+    assert [err is None for _, _, err in results[:len(MIXED)]] == [True] * 3 + [False] * 4 + [True] * 4
+
+
+def test_decode_many_cache_counters():
+    serial_codec.decode_serial_to_string(SERIALS[0])
+    serial_codec.decode_many(SERIALS)
+    assert serial_codec.cache_info()[:3] == (1, 3, 3)
+    serial_codec.decode_many(SERIALS)
+    assert serial_codec.cache_info()[:3] == (4, 3, 3)
+
+
+def test_decode_many_pool_matches_in_process(force_pool):
+    assert serial_codec.decode_many(MIXED, workers=2, chunksize=2) == _expected_decode(MIXED)
+
+
+def test_encode_many_matches_single(b85_backend):
+    strings = (STRINGS + BAD_STRINGS) * 6
+    expected = [serial_codec.encode_string_to_serial(s) for s in strings]
+    assert serial_codec.encode_many(strings) == expected
+    assert [err is None for _, err in expected[:6]] == [True] * 3 + [False] * 3
+
+    expected = [serial_encoder.encode_to_base85(s, new_level=40) for s in strings]
+    assert serial_encoder.encode_many(strings, new_level=40) == expected
+    assert serial_encoder.encode_many(STRINGS) == [(s, "") for s in SERIALS]
+
+
+def test_encode_many_pool_matches_in_process(force_pool):
+    strings = STRINGS + BAD_STRINGS
+    expected = [serial_codec.encode_string_to_serial(s) for s in strings]
+    assert serial_codec.encode_many(strings, workers=2) == expected
+
+    expected = [serial_encoder.encode_to_base85(s, new_level=40) for s in strings]
+    assert serial_encoder.encode_many(strings, new_level=40, workers=2) == expected
+
+
+def test_small_inputs_stay_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool used")
+    monkeypatch.setattr(pool, "ProcessPoolExecutor", no_pool)
+    assert len(serial_codec.decode_many(SERIALS, workers=8)) == 3
+    assert serial_codec.encode_many(STRINGS, workers=1, chunksize=1) == [(s, None) for s in SERIALS]
+    assert pool.map_chunks(list, [], workers=4, min_items=0) == []
+
+
+def test_pool_failure_is_logged(force_pool, monkeypatch, caplog):
+    def broken_pool(*args, **kwargs):
+        raise OSError("no processes here")
+    monkeypatch.setattr(pool, "ProcessPoolExecutor", broken_pool)
+    with caplog.at_level(logging.WARNING, logger=pool.__name__):
+        assert serial_codec.encode_many(STRINGS, workers=2) == [(s, None) for s in SERIALS]
+    assert "no processes here" in caplog.text
+
+
+def test_blocks_pickle():
+    _, blocks, _ = serial_codec.decode_serial_to_string(SERIALS[0])
+    copied = pickle.loads(pickle.dumps(blocks))
+    assert copied == blocks
+    assert [type(b.token) for b in copied] == [type(b.token) for b in blocks]
@@ -0,0 +1,81 @@
+import pytest
+
+import serial_codec
+from serial_codec import cache_info, clear_cache, decode_serial_to_string
+
+SERIAL = serial_codec.encode_string_to_serial("1, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|")[0]
+
+
+pytestmark = pytest.mark.usefixtures("empty_cache")
+
+
+def test_repeated_decode_hits_cache():
+    first = decode_serial_to_string(SERIAL)
+    assert cache_info()[:2] == (0, 1)
+    second = decode_serial_to_string(SERIAL)
+    assert second == first
+    assert cache_info() == (1, 1, 1, len(SERIAL))
+
+    text, blocks, err = first
+    assert err is None
+    assert text == "1, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|"
+    assert isinstance(blocks, list)
+
+
+def test_cached_blocks_are_not_shared():
+    _, blocks, _ = decode_serial_to_string(SERIAL)
+    blocks[3].value = 99
+    blocks[-2].part.values.append(1)
+    blocks.pop()
+
+    _, again, _ = decode_serial_to_string(SERIAL)
+    assert cache_info().hits == 1
+    assert again == serial_codec._decode_uncached(SERIAL)[1]
+    assert all(a is not b for a, b in zip(again, blocks))
+    assert decode_serial_to_string(SERIAL)[1][-2].part is not again[-2].part
+
+
+def test_cached_result_matches_uncached():
+    assert decode_serial_to_string(SERIAL) == serial_codec._decode_uncached(SERIAL)
+
+
+def test_errors_are_cached_but_bad_prefix_is_not():
+    bad = "@U!!!!!"
+    assert decode_serial_to_string(bad)[2] is not None
+    assert decode_serial_to_string(bad)[2] is not None
+    assert cache_info()[:3] == (1, 1, 1)
+
+    assert decode_serial_to_string("nope")[2] is not None
+    assert cache_info()[:3] == (1, 1, 1)
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(serial_codec, "DECODE_CACHE_SIZE", 2)
+    serials = [serial_codec.encode_string_to_serial(f"{i}, 0, 1, 50| 2, 3||")[0] for i in range(3)]
+    decode_serial_to_string(serials[0])
+    decode_serial_to_string(serials[1])
+    decode_serial_to_string(serials[0])  # serials[1] is now least recently used
+    decode_serial_to_string(serials[2])
+    assert cache_info().entries == 2
+
+    decode_serial_to_string(serials[0])
+    assert cache_info().hits == 2
+    decode_serial_to_string(serials[1])
+    assert cache_info().misses == 4
+
+
+def test_char_budget(monkeypatch):
+    monkeypatch.setattr(serial_codec, "DECODE_CACHE_CHARS", len(SERIAL) + 1)
+    other = serial_codec.encode_string_to_serial("9, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|")[0]
+    decode_serial_to_string(SERIAL)
+    decode_serial_to_string(other)
+    info = cache_info()
+    assert info.entries == 1
+    assert info.chars <= len(SERIAL) + 1
+
+
+def test_clear_cache_resets_counters():
+    decode_serial_to_string(SERIAL)
+    decode_serial_to_string(SERIAL)
+    clear_cache()
+    assert cache_info() == (0, 0, 0, 0)
@@ -0,0 +1,82 @@
+import pytest
+
+import serial_codec
+from codec.b4s.serial.header import peek_header
+from codec.b4s.serial.item import DecodedItem
+from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+
+TEXT = "7, 0, 1, 50| 2, 3308|| {4} {5:6} {7:[8 8 9]}|"
+
+
+def test_header_fields():
+    item = DecodedItem.from_string(TEXT)
+    assert item.type_id == 7
+    assert item.flags == (0, 1)
+    assert item.level == 50
+    assert item.seed == 3308
+    assert item.groups == ((7, 0, 1, 50), (2, 3308))
+    assert item.header == peek_header(item.to_serial())
+
+
+def test_parts_and_text():
+    item = DecodedItem.from_string(TEXT)
+    assert item.parts == [
+        Part(4, PartSubType.SUBTYPE_NONE),
+        Part(5, PartSubType.SUBTYPE_INT, 6),
+        Part(7, PartSubType.SUBTYPE_LIST, values=[8, 8, 9]),
+    ]
+    assert item.text == TEXT
+    assert item.parts_text == "{4} {5:6} {7:[8 8 9]}|"
+
+
+def test_accessors_return_copies():
+    item = serial_codec.decode_item(serial_codec.encode_string_to_serial(TEXT)[0])[0]
+    item.parts[0].index = 99
+    item.parts[2].values.append(1)
+    item.blocks[3].value = 99
+    item.body_blocks[0].part.index = 99
+    assert item.text == TEXT
+    assert item.to_serial() == serial_codec.encode_string_to_serial(TEXT)[0]
+    assert item.level == 50
+
+
+def test_level_and_seed_edits_match_text_encoding():
+    item = DecodedItem.from_string(TEXT)
+    item.level = 60
+    item.seed = 70000
+    expected = "7, 0, 1, 60| 2, 70000|| {4} {5:6} {7:[8 8 9]}|"
+    assert item.text == expected
+    assert item.to_serial() == serial_codec.encode_string_to_serial(expected)[0]
+    assert DecodedItem.from_serial(item.to_serial()).level == 60
+
+
+def test_edits_leave_cached_blocks_alone():
+    serial = serial_codec.encode_string_to_serial(TEXT)[0]
+    item, err = serial_codec.decode_item(serial)
+    assert err is None
+    item.level = 1
+    assert serial_codec.decode_item(serial)[0].level == 50
+    assert serial_codec.decode_serial_to_string(serial)[0] == TEXT
+
+
+@pytest.mark.parametrize("text", ["{4} {5}|", "1, 2, 3|| {4}|", "1, 2, {3}, 4|| {5}|"])
+def test_no_header(text):
+    item = DecodedItem.from_string(text)
+    assert item.header is None
+    assert item.level is None and item.type_id is None and item.seed is None
+    assert item.text == text
+    with pytest.raises(ValueError):
+        item.level = 5
+
+
+def test_no_seed_group():
+    item = DecodedItem.from_string("7, 0, 1, 50|| {4}|")
+    assert item.seed is None
+    with pytest.raises(ValueError):
+        item.seed = 1
+
+
+def test_decode_item_error():
+    item, err = serial_codec.decode_item("@U!!!!!")
+    assert item is None and err
+
@@ -0,0 +1,250 @@
+"""
+Differential tests: the codec against the original pre-optimization codec in
+baseline_codec/, over random block streams, random serials and the item
+corpora.
+"""
+import random
+
+import pytest
+
+from baseline_codec import main as base_main
+from baseline_codec.b4s.b85 import decode as base_b85_decode
+from baseline_codec.b4s.b85 import encode as base_b85_encode
+from baseline_codec.b4s.serial import block as base_block
+from baseline_codec.b4s.serial import deserialize as base_deserialize
+from baseline_codec.b4s.serial import from_string as base_from_string
+from baseline_codec.b4s.serial import serialize as base_serialize
+from baseline_codec.b4s.serial_datatypes.part import part as base_part
+from baseline_codec.b4s.serial_tokenizer import tokenizer as base_tokenizer
+from codec.b4s.b85.decode import decode
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.block import Block
+from codec.b4s.serial.deserialize import deserialize
+from codec.b4s.serial.encode_text import encode_text
+from codec.b4s.serial.formatter import format_blocks
+from codec.b4s.serial.from_string import from_string
+from codec.b4s.serial.serialize import serialize
+from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+from codec.b4s.serial_tokenizer.tokenizer import Token
+from corpora import godroll_texts, reference_texts
+
+B85_CHARSET = base_b85_decode.B85_CHARSET
+
+# Blocks from either codec are compared as plain tuples:
+#   ("sep1",) ("sep2",) ("varint", v) ("varbit", v) ("string", s)
+#   ("part", index, "none") ("part", index, "int", v) ("part", index, "list", [v, ...])
+_TOKEN_NAMES = {
+    "TOK_SEP1": "sep1", "TOK_SEP2": "sep2", "TOK_VARINT": "varint",
+    "TOK_VARBIT": "varbit", "TOK_PART": "part", "TOK_STRING": "string",
+}
+_TOKEN_ENUM_NAMES = {name: enum_name for enum_name, name in _TOKEN_NAMES.items()}
+_SUB_TYPE_NAMES = {"SUBTYPE_NONE": "none", "SUBTYPE_INT": "int", "SUBTYPE_LIST": "list"}
+_SUB_TYPE_ENUM_NAMES = {name: enum_name for enum_name, name in _SUB_TYPE_NAMES.items()}
+
+
+def to_tuple(block) -> tuple:
+    name = _TOKEN_NAMES[block.token.name]
+    if name in ("varint", "varbit"):
+        return (name, block.value)
+    if name == "string":
+        return (name, block.value_str)
+    if name == "part":
+        part = block.part
+        sub_type = _SUB_TYPE_NAMES[part.sub_type.name]
+        if sub_type == "none":
+            return (name, part.index, sub_type)
+        if sub_type == "int":
+            return (name, part.index, sub_type, part.value)
+        return (name, part.index, sub_type, list(part.values))
+    return (name,)
+
+
+def to_block(t: tuple) -> Block:
+    token = Token[_TOKEN_ENUM_NAMES[t[0]]]
+    if t[0] in ("varint", "varbit"):
+        return Block(token, t[1])
+    if t[0] == "string":
+        return Block(token, value_str=t[1])
+    if t[0] == "part":
+        sub_type = PartSubType[_SUB_TYPE_ENUM_NAMES[t[2]]]
+        if t[2] == "int":
+            return Block(token, part=Part(t[1], sub_type, t[3]))
+        if t[2] == "list":
+            return Block(token, part=Part(t[1], sub_type, values=list(t[3])))
+        return Block(token, part=Part(t[1], sub_type))
+    return Block(token)
+
+
+def _to_base_block(t: tuple):
+    block = base_block.Block(base_tokenizer.Token[_TOKEN_ENUM_NAMES[t[0]]])
+    if t[0] in ("varint", "varbit"):
+        block.value = t[1]
+    elif t[0] == "string":
+        block.value_str = t[1]
+    elif t[0] == "part":
+        part = base_part.Part()
+        part.index = t[1]
+        part.sub_type = base_part.PartSubType[_SUB_TYPE_ENUM_NAMES[t[2]]]
+        if t[2] == "int":
+            part.value = t[3]
+        elif t[2] == "list":
+            part.values = list(t[3])
+        block.part = part
+    return block
+
+
+# --- The original codec, on tuples ---
+
+def ref_b85_decode(serial: str) -> bytes:
+    return base_b85_decode.decode(serial)
+
+
+def ref_b85_encode(data: bytes) -> str:
+    return base_b85_encode.encode(data)
+
+
+def ref_serialize(blocks: list[tuple]) -> bytes:
+    return bytes(base_serialize.serialize([_to_base_block(t) for t in blocks]))
+
+
+def ref_deserialize(data: bytes) -> list[tuple]:
+    blocks, _, err = base_deserialize.deserialize(data)
+    if err:
+        raise err
+    return [to_tuple(b) for b in blocks]
+
+
+def ref_format_blocks(blocks: list[tuple]) -> str:
+    return base_main.format_blocks([_to_base_block(t) for t in blocks])
+
+
+def ref_from_string(text: str) -> list[tuple]:
+    return [to_tuple(b) for b in base_from_string.from_string(text)]
+
+
+def _outcome(fn, *args):
+    """The result of fn, or the type of the error it raised."""
+    try:
+        return "ok", fn(*args)
+    except Exception as e:
+        return "error", type(e).__name__
+
+
+def _codec_deserialize(data) -> list[tuple]:
+    blocks, _, err = deserialize(data)
+    if err:
+        raise err
+    return [to_tuple(b) for b in blocks]
+
+
+# --- Random streams ---
+
+def _random_value(rnd: random.Random) -> int:
+    bits = rnd.choice((1, 3, 4, 5, 8, 12, 16, 16, 20, 31))
+    return rnd.randrange(1 << bits)
+
+
+def _random_list(rnd: random.Random) -> list[int]:
+    shape = rnd.randrange(4)
+    if shape == 0:
+        return [_random_value(rnd) for _ in range(rnd.randint(0, 12))]
+    if shape == 1:
+        # Long run of one value, like stacked modded parts
+        return [_random_value(rnd)] * rnd.randint(2, 600)
+    if shape == 2:
+        period = [_random_value(rnd) for _ in range(rnd.randint(1, 8))]
+        return period * rnd.randint(2, 80) + period[:rnd.randrange(len(period))]
+    return [rnd.choice((0, 1, 43, 70000)) for _ in range(rnd.randint(1, 300))]
+
+
+def _random_block(rnd: random.Random) -> tuple:
+    kind = rnd.choice(("sep1", "sep2", "varint", "varbit", "part", "part", "string"))
+    if kind == "varint":
+        return (kind, rnd.randrange(1 << 16))
+    if kind == "varbit":
+        return (kind, _random_value(rnd))
+    if kind == "string":
+        alphabet = "abcXYZ 09_-|,{}:[]\"\\"
+        return (kind, "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 16))))
+    if kind == "part":
+        index = rnd.randrange(1 << 12)
+        sub_type = rnd.choice(("none", "int", "list"))
+        if sub_type == "none":
+            return (kind, index, sub_type)
+        if sub_type == "int":
+            return (kind, index, sub_type, rnd.randrange(1 << 16))
+        return (kind, index, sub_type, _random_list(rnd))
+    return (kind,)
+
+
+def _random_streams(n: int, seed: int) -> list[list[tuple]]:
+    rnd = random.Random(seed)
+    return [[_random_block(rnd) for _ in range(rnd.randint(0, 40))] for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_block_streams(seed):
+    for stream in _random_streams(100, seed):
+        blocks = [to_block(t) for t in stream]
+
+        data = serialize(blocks)
+        assert bytes(data) == ref_serialize(stream)
+
+        serial = encode(data)
+        assert serial == ref_b85_encode(data)
+        assert decode(serial) == ref_b85_decode(serial)
+
+        expected = ref_deserialize(ref_b85_decode(serial))
+        assert _codec_deserialize(decode(serial)) == expected
+
+        text = format_blocks(deserialize(decode(serial))[0])
+        assert text == ref_format_blocks(expected)
+
+        # And back from the text. Strings ending in a backslash don't survive
+        # the text form, both sides must fail the same way then.
+        expected = _outcome(ref_from_string, text)
+        assert _outcome(lambda s: [to_tuple(b) for b in from_string(s)], text) == expected
+        if expected[0] == "ok":
+            assert encode_text(text) == ref_b85_encode(ref_serialize(expected[1]))
+
+
+def test_random_serials():
+    rnd = random.Random(20)
+    alphabet = B85_CHARSET + " \t\"'.,\\\xe9\xff"
+    for _ in range(1500):
+        body = "".join(rnd.choice(alphabet if rnd.random() < 0.2 else B85_CHARSET)
+                       for _ in range(rnd.randint(0, 60)))
+        serial = "@U" + body
+        assert decode(serial) == ref_b85_decode(serial), serial
+
+        data = ref_b85_decode(serial)
+        assert _outcome(_codec_deserialize, data) == _outcome(ref_deserialize, data), serial
+
+
+def test_random_texts():
+    rnd = random.Random(20)
+    pieces = ["1", "42", "65535", "70000", ",", "|", "||", " ", "{3}", "{ 4 : 5 }", "{6:[1 2 3]}",
+              "{7:[ , ]}", "{8:[1:2]}", "{9:[4 5]:x}", '"ab"', '"a\\"b"', "{", '"', "x", "{a}"]
+    for _ in range(3000):
+        text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 12)))
+        expected = _outcome(ref_from_string, text)
+        actual = _outcome(lambda s: [to_tuple(b) for b in from_string(s)], text)
+        assert actual == expected, text
+        if expected[0] == "ok":
+            assert encode_text(text) == ref_b85_encode(ref_serialize(expected[1])), text
+
+
+# --- Corpora ---
+
+def test_replay_corpora():
+    for text in godroll_texts() + reference_texts():
+        expected_blocks = ref_from_string(text)
+        serial = ref_b85_encode(ref_serialize(expected_blocks))
+        assert encode_text(text) == serial, text
+        assert encode(serialize(from_string(text))) == serial, text
+
+        data = decode(serial)
+        assert data == ref_b85_decode(serial)
+        blocks, _, err = deserialize(data)
+        assert err is None
+        assert format_blocks(blocks) == ref_format_blocks(ref_deserialize(data))
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.encode_text import encode_text
+from codec.b4s.serial.from_string import from_string
+from codec.b4s.serial.serialize import serialize
+from corpora import godroll_texts, modded_texts, reference_texts
+
+
+def _pipeline(text: str) -> str:
+    return encode(serialize(from_string(text)))
+
+
+def _random_texts(n: int = 500) -> list[str]:
+    rnd = random.Random(14)
+    texts = []
+    for _ in range(n):
+        items = []
+        for _ in range(rnd.randint(1, 30)):
+            kind = rnd.randrange(7)
+            v = rnd.choice((rnd.randrange(32), rnd.randrange(1 << 16), rnd.randrange(1 << 20)))
+            if kind == 0:
+                items.append(str(v))
+            elif kind == 1:
+                items.append(rnd.choice(("|", ",", "||")))
+            elif kind == 2:
+                items.append(f"{{{v}}}")
+            elif kind == 3:
+                items.append(f"{{{rnd.randrange(300)}:{v}}}")
+            elif kind == 4:
+                values = " ".join(str(rnd.randrange(1 << rnd.randint(1, 18))) for _ in range(rnd.randint(0, 8)))
+                items.append(f"{{{rnd.randrange(300)}:[{values}]}}")
+            elif kind == 5:
+                items.append('"' + "".join(rnd.choice(('a', 'b', ' ', '_', '\\"')) for _ in range(rnd.randint(0, 10))) + '"')
+            else:
+                items.append(f"{{ {v} :  [ {v}, {v} ] }}")
+        texts.append(" ".join(items))
+    return texts
+
+
+@pytest.mark.parametrize("corpus", [godroll_texts, modded_texts, reference_texts, _random_texts])
+def test_encode_text_matches_pipeline(corpus):
+    for text in corpus():
+        assert encode_text(text) == _pipeline(text), text
+
+
+@pytest.mark.parametrize("text", [
+    "1, 2 x",
+    "1, {2:[3 4]",
+    '1, "abc',
+    "1, {2:[3:4]}",
+    "1, {a}",
+    '1, "café"',
+    '1, "café" x',
+])
+def test_encode_text_errors_match_pipeline(text):
+    with pytest.raises(Exception) as expected:
+        _pipeline(text)
+    with pytest.raises(type(expected.value)) as actual:
+        encode_text(text)
+    assert str(actual.value) == str(expected.value)
@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import pytest
+
+from codec.b4s.serial.block import Block
+from codec.b4s.serial.formatter import format_blocks, canonical_string
+from codec.b4s.serial.from_string import from_string
+from codec.b4s.serial_datatypes.part import cache as part_cache
+from codec.b4s.serial_datatypes.part.part import Part, PartSubType
+from codec.b4s.serial_tokenizer.tokenizer import Token
+from corpora import godroll_texts, modded_texts
+
+
+def _reference_render(block: Block) -> tuple[str, bool]:
+    # The per-block formatter that main.py and serial_codec.py used to carry
+    token = block.token
+    if token in (Token.TOK_VARINT, Token.TOK_VARBIT):
+        return str(block.value), True
+    if token == Token.TOK_PART:
+        part = block.part
+        if part.sub_type == PartSubType.SUBTYPE_NONE:
+            return f"{{{part.index}}}", True
+        if part.sub_type == PartSubType.SUBTYPE_INT:
+            return f"{{{part.index}:{part.value}}}", True
+        values_str = ' '.join(map(str, part.values))
+        return "{" + f"{part.index}:[{values_str}]" + "}", True
+    if token == Token.TOK_STRING:
+        escaped_str = block.value_str.replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped_str}"', True
+    if token == Token.TOK_SEP1:
+        return "|", False
+    return ",", False
+
+
+def _reference_format(blocks: list[Block]) -> str:
+    output_parts = []
+    for i, block in enumerate(blocks):
+        current_part, is_data_block = _reference_render(block)
+        output_parts.append(current_part)
+        if i + 1 < len(blocks):
+            next_token = blocks[i + 1].token
+            if is_data_block and next_token not in (Token.TOK_SEP1, Token.TOK_SEP2):
+                output_parts.append(" ")
+            elif block.token == Token.TOK_SEP2:
+                output_parts.append(" ")
+            elif block.token == Token.TOK_SEP1 and next_token != Token.TOK_SEP1:
+                output_parts.append(" ")
+    return "".join(output_parts)
+
+
+def _sample_block(token: Token, rnd: random.Random) -> Block:
+    if token in (Token.TOK_VARINT, Token.TOK_VARBIT):
+        return Block(token, rnd.randrange(1 << 16))
+    if token == Token.TOK_PART:
+        sub_type = rnd.choice(list(PartSubType))
+        return Block(token, part=Part(rnd.randrange(300), sub_type, rnd.randrange(100),
+                                      [rnd.randrange(100) for _ in range(rnd.randint(0, 5))]))
+    if token == Token.TOK_STRING:
+        return Block(token, value_str=rnd.choice(['', 'abc', 'a"b', 'c\\d', '\\"']))
+    return Block(token)
+
+
+@pytest.mark.parametrize("first,second", list(itertools.product(Token, repeat=2)))
+def test_spacing_between_every_token_pair(first, second):
+    rnd = random.Random(15)
+    blocks = [_sample_block(first, rnd), _sample_block(second, rnd)]
+    assert format_blocks(blocks) == _reference_format(blocks)
+
+
+def test_random_block_sequences():
+    rnd = random.Random(15)
+    tokens = list(Token)
+    for _ in range(2000):
+        blocks = [_sample_block(rnd.choice(tokens), rnd) for _ in range(rnd.randint(0, 12))]
+        assert format_blocks(blocks) == _reference_format(blocks)
+        assert canonical_string(blocks) == "".join(_reference_render(b)[0] for b in blocks)
+
+
+def test_corpus_texts():
+    for text in godroll_texts() + modded_texts():
+        blocks = from_string(text)
+        assert format_blocks(blocks) == _reference_format(blocks)
+
+
+def test_formatting_skips_the_bit_patterns(monkeypatch):
+    def no_pattern(*args):
+        raise AssertionError("bit pattern built")
+    monkeypatch.setattr(part_cache, "part_pattern", no_pattern)
+    part_cache.clear_part_cache()
+    try:
+        blocks = from_string("1, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|")
+        assert format_blocks(blocks) == "1, 0, 1, 50| 2, 3|| {4} {5:6} {7:[8 8 9]}|"
+    finally:
+        part_cache.clear_part_cache()
+
+
+def test_empty():
+    assert format_blocks([]) == ""
+    assert canonical_string([]) == ""
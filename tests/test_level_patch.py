@@ -0,0 +1,155 @@
+import pytest
+
+import save_ops
+import serial_codec
+from codec.b4s.b85.decode import decode
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.deserialize import deserialize
+from codec.b4s.serial.formatter import format_blocks
+from codec.b4s.serial.header import peek_header
+from codec.b4s.serial.item import DecodedItem
+from codec.b4s.serial import level_patch
+from codec.b4s.serial.level_patch import patch_level
+
+TEXTS = [
+    "7, 0, 1, 50| 2, 3308|| {4} {5:6} {7:[8 8 9]}|",
+    "7, 0, 1, 5| 2, 3308|| {4} {5:6} {7:[8 8 9]}|",
+    "267, 0, 1, 60| 2, 1|| " + " ".join(["{11}"] * 300) + " {245:[39 39 39 39 39]}|",
+    "1, 2, 3, 4, 5| 9, 9|| \"name\" {1}|",
+]
+LEVELS = [0, 1, 15, 16, 50, 255, 256, 4096, 65535]
+
+
+def _serial(text: str) -> str:
+    return serial_codec.encode_string_to_serial(text)[0]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("level", LEVELS)
+def test_matches_full_reencode(text, level):
+    serial = _serial(text)
+    item = DecodedItem.from_serial(serial)
+    item.level = level
+    assert patch_level(serial, level) == item.to_serial()
+    assert peek_header(patch_level(serial, level)).level == level
+
+
+def test_same_width_only_touches_the_level_groups():
+    serial = _serial(TEXTS[2])
+    patched = patch_level(serial, 60 + 1)
+    changed = [i for i, (a, b) in enumerate(zip(serial, patched)) if a != b]
+    assert len(patched) == len(serial)
+    assert changed and changed[-1] - changed[0] < 10
+
+
+def test_leaves_other_blocks_as_written():
+    # 65581 only fits a varint once truncated to 45, but keeps its 4 blocks
+    serial = _serial("65581, 0, 1, 16|| {1}|")
+    patched = patch_level(serial, 1)
+    assert format_blocks(deserialize(decode(patched))[0]) == "45, 0, 1, 1|| {1}|"
+    assert decode(patched).hex().startswith(decode(serial).hex()[:4])
+
+
+def test_same_level_returns_serial():
+    serial = _serial(TEXTS[0])
+    assert patch_level(serial, 50) is serial
+
+
+def test_characters_outside_the_charset():
+    # Trailing whitespace from a pasted serial decodes to the same data
+    noisy = _serial(TEXTS[0]) + " \n"
+    patched = patch_level(noisy, 16)
+    assert format_blocks(deserialize(decode(patched))[0]) == "7, 0, 1, 16| 2, 3308|| {4} {5:6} {7:[8 8 9]}|"
+
+
+def _truncated(text: str, n_bytes: int) -> str:
+    # Serial whose data stops inside a block after the header
+    return encode(decode(_serial(text))[:n_bytes])
+
+
+BAD_HEADERS = [
+    "nope",
+    "@U!!!!!",
+    _serial("{4} {5}|"),
+    _serial("1, 2, 3|| {4}|"),
+    _serial("1, 2, 3, 4||"),  # The '||' reads back as a single terminator
+]
+CORRUPT_BODIES = [
+    _truncated(TEXTS[0], 15),  # Inside the list part
+    _truncated("7, 0, 1, 50| 2, 3308|| \"abcdef\" {1}|", 13),  # Inside the string
+]
+
+
+@pytest.mark.parametrize("serial", BAD_HEADERS + CORRUPT_BODIES)
+def test_invalid(serial):
+    # Rejected whether the level is unchanged, keeps its width or changes it
+    for level in (50, 51, 5):
+        with pytest.raises(ValueError):
+            patch_level(serial, level, validate=True)
+
+
+@pytest.mark.parametrize("serial", CORRUPT_BODIES)
+def test_body_only_read_when_needed(serial):
+    # Without validate, a level of the same width never reaches the body
+    assert patch_level(serial, 50) is serial
+    assert peek_header(patch_level(serial, 51)).level == 51
+    # A change of width has to find the end of the item
+    with pytest.raises(ValueError):
+        patch_level(serial, 5)
+
+
+def test_validate_reuses_the_decode_cache(monkeypatch, empty_cache):
+    serial = _serial(TEXTS[0])
+    serial_codec.decode_serial_to_string(serial)
+    for corrupt in CORRUPT_BODIES:
+        serial_codec.decode_serial_to_string(corrupt)
+
+    def no_walk(*args):
+        raise AssertionError("body walked")
+    monkeypatch.setattr(level_patch, "_content_end", no_walk)
+    assert peek_header(serial_codec.patch_level(serial, 51, validate=True)).level == 51
+    # Cached as not decoding, so still walked
+    for corrupt in CORRUPT_BODIES:
+        with pytest.raises(AssertionError):
+            serial_codec.patch_level(corrupt, 51, validate=True)
+
+
+@pytest.mark.parametrize("serial", BAD_HEADERS)
+def test_invalid_header(serial):
+    with pytest.raises(ValueError):
+        peek_header(serial)
+
+
+def test_negative_level():
+    with pytest.raises(ValueError):
+        patch_level(_serial(TEXTS[0]), -1)
+
+
+def _save(level, serials):
+    backpack = {f"slot_{i}": {"serial": s} for i, s in enumerate(serials)}
+    return {"state": {"experience": [{"type": "Character", "level": level}],
+                      "inventory": {"items": {"backpack": backpack}}}}
+
+
+def test_save_level_sync_reports_corrupt_items():
+    serials = [_serial(TEXTS[0]), _serial(TEXTS[1])] + CORRUPT_BODIES
+    save = _save(50, serials)
+    success, fail, info = save_ops.sync_inventory_item_levels(save)
+    assert (success, fail) == (2, 2)
+    assert [s.split(":")[0] for s in info] == ["slot_2", "slot_3"]
+
+    backpack = save["state"]["inventory"]["items"]["backpack"]
+    assert [backpack[f"slot_{i}"]["serial"] for i in range(4)] == [serials[0], _serial(TEXTS[0])] + CORRUPT_BODIES
+    assert save_ops.set_backpack_item_levels(_save(50, CORRUPT_BODIES), 50)[:2] == (0, 2)
+
+
+@pytest.mark.parametrize("level", ["60", 60.0])
+def test_save_level_sync_converts_character_level(level):
+    save = _save(level, [_serial(TEXTS[0])])
+    assert save_ops.sync_inventory_item_levels(save)[:2] == (1, 0)
+    assert peek_header(save["state"]["inventory"]["items"]["backpack"]["slot_0"]["serial"]).level == 60
+
+
+@pytest.mark.parametrize("level", [[], "high"])
+def test_save_level_sync_bad_character_level(level):
+    assert save_ops.sync_inventory_item_levels(_save(level, [_serial(TEXTS[0])]))[:2] == (0, 0)
@@ -0,0 +1,72 @@
+"""
+Round trips over the item corpora. The same tests run against the compiled
+speedups when they are built and, through test_backends.py, against the
+pure-Python codec.
+"""
+import random
+
+import pytest
+
+import codec
+from codec.b4s.b85.decode import decode, decode_view
+from codec.b4s.b85.encode import encode
+from codec.b4s.serial.deserialize import deserialize
+from codec.b4s.serial.encode_text import encode_text
+from codec.b4s.serial.formatter import format_blocks
+from codec.b4s.serial.from_string import from_string
+from codec.b4s.serial.serialize import serialize
+from codec.b4s.serial_datatypes.varbit.read import read_varbit
+from codec.b4s.serial_datatypes.varbit.write import write as write_varbit
+from codec.b4s.serial_datatypes.varint.read import read_varint
+from codec.b4s.serial_datatypes.varint.write import write as write_varint
+from codec.lib.bit.reader import BitReader
+from codec.lib.bit.writer import Writer
+from corpora import godroll_texts, reference_texts
+
+
+@pytest.mark.parametrize("corpus", [godroll_texts, reference_texts])
+def test_text_serial_text(corpus):
+    for text in corpus():
+        serial = encode_text(text)
+        blocks, _, err = deserialize(decode_view(serial))
+        assert err is None, text
+        assert format_blocks(blocks) == format_blocks(from_string(text))
+        # And back to the very same serial
+        assert encode(serialize(blocks)) == serial
+
+
+def test_b85_bytes_round_trip():
+    rnd = random.Random(19)
+    for n in list(range(40)) + [rnd.randrange(2000) for _ in range(200)]:
+        data = bytes(rnd.randrange(256) for _ in range(n))
+        serial = encode(data)
+        assert decode(serial) == data
+        assert bytes(decode_view(serial)) == data
+        assert encode(bytearray(data)) == serial
+        assert encode(memoryview(data)) == serial
+
+
+def test_varint_varbit_round_trip():
+    rnd = random.Random(19)
+    values = list(range(300)) + [rnd.randrange(1 << 16) for _ in range(2000)]
+    bw = Writer()
+    for v in values:
+        write_varint(bw, v)
+        write_varbit(bw, v)
+    br = BitReader(bytes(bw.get_data()))
+    for v in values:
+        assert read_varint(br) == v
+        assert read_varbit(br) == v
+
+
+def test_truncated_reads_raise():
+    bw = Writer()
+    write_varint(bw, 0xFFFF)
+    data = bytes(bw.get_data())
+    for cut in range(len(data)):
+        with pytest.raises(IOError):
+            read_varint(BitReader(data[:cut]))
+
+
+def test_backend_flag():
+    assert codec.ACCELERATED == (codec.speedups is not None)